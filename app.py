@@ -2,17 +2,6 @@ import streamlit as st
 from collections.abc import Mapping
 from db.db_utils import load_platforms
 
-# Global connection pool for better performance
-CONNECTION_POOL = st.connection("postgresql", type="sql", ttl=3600)
-from ui.positions_ui import positions_ui
-from ui.option_trades_ui import option_trades_ui
-from ui.portfolio_report import portfolio_ui
-from ui.data_entry import data_entry
-from ui.dashboard import dashboard
-from ui.taxes_ui import taxes_ui
-from ui.weekly_monthly_pl_report import weekly_monthly_pl_report_ui
-from ui.cash_flows_ui import cash_flows_ui
-
 st.set_page_config(page_title="Portfolio Tracker", layout="wide")
 
 NAVIGATION = {
@@ -26,21 +15,19 @@ NAVIGATION = {
     "Data Entry": "\U0001F4DD Data Entry"
 }
 
-# Add config for authentication toggle
-def is_auth_enabled():
-    # Use st.secrets for config, fallback to True if not set
-    return str(st.secrets.get("auth_enabled", "true")).lower() == "true"
+# Authentication toggle, resolved once from st.secrets (defaults to enabled)
+AUTH_ENABLED: bool = str(st.secrets.get("auth_enabled", "true")).lower() == "true"
 
 USERNAME = st.secrets.get("auth_username")
 PASSWORD = st.secrets.get("auth_password")
 
-if is_auth_enabled():
+if AUTH_ENABLED:
     if not USERNAME or not PASSWORD:
         st.error("Authentication credentials are not set. Please configure them in the Streamlit secrets.toml file.")
         st.stop()
 
 def main():
-    if is_auth_enabled():
+    if AUTH_ENABLED:
         if "authenticated" not in st.session_state:
             st.session_state["authenticated"] = False
 
@@ -72,31 +59,40 @@ def main():
         key="nav_radio"
     )
 
-    # Lazy loading - only load page content when needed
+    # Lazy loading - page modules are imported on first visit and then
+    # reused from sys.modules on later reruns
     # Use page-specific loading states for better UX
     if page == "Dashboard":
         with st.spinner("Loading dashboard..."):
+            from ui.dashboard import dashboard
             dashboard()
     elif page == "Portfolio":
         with st.spinner("Loading portfolio..."):
+            from ui.portfolio_report import portfolio_ui
             portfolio_ui()
     elif page == "Positions":
         with st.spinner("Loading positions..."):
+            from ui.positions_ui import positions_ui
             positions_ui()
     elif page == "Option Trades":
         with st.spinner("Loading option trades..."):
+            from ui.option_trades_ui import option_trades_ui
             option_trades_ui()
     elif page == "Weekly & Monthly P/L Report":
         with st.spinner("Loading P/L reports..."):
+            from ui.weekly_monthly_pl_report import weekly_monthly_pl_report_ui
             weekly_monthly_pl_report_ui()
     elif page == "Cash Flows":
         with st.spinner("Loading cash flows..."):
+            from ui.cash_flows_ui import cash_flows_ui
             cash_flows_ui()
     elif page == "Taxes":
         with st.spinner("Loading tax data..."):
+            from ui.taxes_ui import taxes_ui
             taxes_ui()
     elif page == "Data Entry":
         with st.spinner("Loading data entry..."):
+            from ui.data_entry import data_entry
             data_entry()
 
 if __name__ == "__main__":
@@ -10,13 +10,26 @@ class Config:
         'positions': 60,        # Position data
         'platforms': 3600,      # Platform data (static)
         'taxes': 3600,          # Tax data (historical)
+        'ticker_types': 90 * 86400,  # ETF/Stock classification (persisted to disk)
     }
     
+    # On-disk cache of ticker ETF/Stock classifications
+    TICKER_TYPE_CACHE_PATH = '.cache/ticker_types.json'
+    
     # Performance settings
     PAGE_SIZE = 100
     MAX_CONCURRENT_REQUESTS = 5
     DB_CONNECTION_TTL = 3600   # 1 hour
     
+    # SQLAlchemy engine pool for the shared Postgres connection
+    DB_POOL = {
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_pre_ping': True,  # Drop dead connections before use
+        'pool_recycle': 1800,   # Recycle connections every 30 minutes
+        'pool_timeout': 30,
+    }
+    
     # UI settings
     DEFAULT_CHART_HEIGHT = 400
     MAX_PIE_CHARTS_PER_ROW = 3
@@ -1,17 +1,110 @@
 import streamlit as st
+import numpy as np
+import pandas as pd
 from sqlalchemy import text
 import datetime
+import functools
+import itertools
 import logging
-from typing import Any, Dict, Optional, List
+import operator
+import threading
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, NamedTuple, Optional, List, Tuple
 from ui.error_handling import handle_database_error
+from config import Config
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# --- SQL statements, built once at import and reused by every call ---
+POSITION_COLUMNS = ["id", "ticker", "trade_type", "position_status", "entry_price",
+                    "quantity", "entry_date", "platform_id", "exit_price", "exit_date", "profit_loss", "direction"]
+OPTION_TRADE_COLUMNS = ["id", "ticker", "platform_id", "strategy", "strike_price", "expiry_date", "trade_date",
+                        "transaction_type", "option_open_price", "open_fee", "option_close_price", "close_fee",
+                        "profit_loss", "status", "close_date", "notes", "quantity"]
+# Everything except the free-text notes, for aggregate views
+OPTION_TRADE_SUMMARY_COLUMNS = [c for c in OPTION_TRADE_COLUMNS if c != "notes"]
+TRADE_COLUMNS = ["id", "ticker", "platform_id", "price", "quantity", "date", "trade_type", "direction"]
+CASH_FLOW_COLUMNS = ["id", "platform_id", "flow_type", "amount", "flow_date", "notes"]
+
+# Order by name ascending for predictable UI ordering
+_Q_LOAD_PLATFORMS = text("SELECT id, name FROM platforms ORDER BY name ASC")
+_Q_LOAD_ALL_POSITIONS = text(f"""
+    SELECT {', '.join(POSITION_COLUMNS)}
+    FROM positions
+    ORDER BY entry_date DESC
+""")
+_Q_LOAD_LEGS_FOR_TRADE = text("SELECT * FROM option_trade_legs WHERE option_trade_id = :tid ORDER BY id")
+_Q_LOAD_ALL_LEGS = text("SELECT * FROM option_trade_legs ORDER BY option_trade_id, id")
+_Q_LOAD_ALL_TRADES = text(f"""
+    SELECT {', '.join(TRADE_COLUMNS)}
+    FROM trades
+    ORDER BY date, id
+""")
+_Q_LOAD_CASH_FLOWS = text(f"SELECT {', '.join(CASH_FLOW_COLUMNS)} FROM cash_flows ORDER BY flow_date DESC")
+_Q_TOTAL_CASH_BY_PLATFORM = text("""
+    SELECT p.name, COALESCE(SUM(CASE WHEN cf.flow_type = 'deposit' THEN cf.amount ELSE -cf.amount END), 0) as total_cash
+    FROM platforms p
+    LEFT JOIN cash_flows cf ON p.id = cf.platform_id
+    GROUP BY p.id, p.name
+    ORDER BY p.name
+""")
+_Q_PLATFORM_CASH_AVAILABLE = text("SELECT name, COALESCE(cash_available, 0) FROM platforms ORDER BY name")
+_Q_GET_METADATA = text("SELECT value FROM app_metadata WHERE key = :key")
+
+# Positions sync (see sync_positions_from_trades)
+_Q_LOCK_POSITIONS = text("LOCK TABLE positions IN SHARE ROW EXCLUSIVE MODE")
+_Q_SYNC_TRADES = text("""
+    SELECT ticker, platform_id,
+           CAST(COALESCE(price, 0) AS DOUBLE PRECISION) AS price,
+           CAST(ROUND(quantity * :qty_scale) AS BIGINT) AS qty_units,
+           date,
+           LOWER(TRIM(COALESCE(trade_type, ''))) AS trade_type,
+           INITCAP(TRIM(COALESCE(direction, 'Long'))) AS direction
+    FROM trades
+    WHERE ROUND(quantity * :qty_scale) <> 0
+    ORDER BY ticker, platform_id, date, id
+""")
+_Q_DELETE_POSITIONS_FOR_KEYS = text("""
+    DELETE FROM positions p
+    USING unnest(CAST(:tickers AS TEXT[]), CAST(:platform_ids AS INTEGER[])) AS k(ticker, platform_id)
+    WHERE p.ticker = k.ticker AND p.platform_id = k.platform_id
+""")
+_Q_INSERT_POSITIONS = text("""
+    INSERT INTO positions (ticker, trade_type, position_status, entry_price, quantity, entry_date, exit_price, exit_date, platform_id, profit_loss, direction)
+    VALUES (:ticker, :trade_type, :position_status, :entry_price, :quantity, :entry_date, :exit_price, :exit_date, :platform_id, :profit_loss, :direction)
+""")
+
+@functools.lru_cache(maxsize=None)
+def _option_trades_query(columns: Tuple[str, ...], by_status: bool):
+    """Build (once per column set) the SELECT used by load_option_trades."""
+    sql = f"SELECT {', '.join(columns)} FROM option_trades"
+    return text(sql + " WHERE status = :status" if by_status else sql)
+
 # --- PlatformCache and related functions ---
 class PlatformCache:
     def __init__(self):
-        self.cache: Dict[str, int] = {}
+        self._cache: Dict[str, int] = {}
+        self._inverse: Dict[int, str] = {}
+
+    @property
+    def cache(self) -> Dict[str, int]:
+        """Mapping of platform_name -> platform_id."""
+        return self._cache
+
+    @cache.setter
+    def cache(self, platforms: Dict[str, int]) -> None:
+        # Build the inverse first so readers never see one map without the other
+        self._inverse = {v: k for k, v in platforms.items()}
+        self._cache = platforms
+
+    @property
+    def id_to_name(self) -> Dict[int, str]:
+        """Mapping of platform_id -> platform_name, rebuilt only when the cache is replaced.
+
+        Shared by every caller; treat it as read-only.
+        """
+        return self._inverse
 
     def keys(self):
         return list(self.cache.keys())
@@ -34,10 +127,26 @@ class PlatformCache:
 
     def id_to_name_map(self) -> Dict[int, str]:
         """Return mapping of platform_id -> platform_name."""
-        return {v: k for k, v in self.cache.items()}
+        return self.id_to_name
 
 PLATFORM_CACHE = PlatformCache()
 
+# Cached functions grouped by the data they read, so writers only invalidate
+# the caches they affect. Populated by @register_cache.
+_CACHE_REGISTRY: Dict[str, List[Callable]] = defaultdict(list)
+
+def register_cache(*cache_types: str) -> Callable:
+    """Register a cached function under one or more cache types.
+
+    Place above @st.cache_data / @st.cache_resource so the registered object
+    is the cached wrapper exposing .clear().
+    """
+    def decorator(func):
+        for cache_type in cache_types:
+            _CACHE_REGISTRY[cache_type].append(func)
+        return func
+    return decorator
+
 def clear_cache_selective(cache_types: List[str] = ['all']):
     """Clear specific cache types instead of all caches.
     
@@ -45,58 +154,75 @@ def clear_cache_selective(cache_types: List[str] = ['all']):
         cache_types: List of cache types to clear. Options:
             - 'positions': Clear position-related caches
             - 'options': Clear option trade caches  
-            - 'portfolio': Clear portfolio calculation caches
+            - 'trades': Clear raw trade caches
             - 'cash': Clear cash flow caches
             - 'platforms': Clear platform caches
+            - 'option_chains': Clear option chain and option price caches
             - 'all': Clear all caches
     """
     if 'all' in cache_types:
         st.cache_data.clear()
         return
     
-    # For now, use a simpler approach - clear all if specific types are requested
-    # TODO: Implement more granular cache clearing when Streamlit API supports it
-    st.cache_data.clear()
+    cleared = set()
+    for cache_type in cache_types:
+        for func in _CACHE_REGISTRY.get(cache_type, []):
+            if id(func) not in cleared:
+                func.clear()
+                cleared.add(id(func))
+
+# Shared connection, created lazily on first use
+_CONNECTION = None
 
 def get_st_connection():
-    """Get a Streamlit SQL connection object from the global pool."""
-    # Import here to avoid circular imports
-    import app
-    return app.CONNECTION_POOL
+    """Get the shared Streamlit SQL connection.
+
+    The connection wraps a single pooled SQLAlchemy engine (see Config.DB_POOL),
+    so every helper checks out a warm connection instead of reconnecting.
+    """
+    global _CONNECTION
+    if _CONNECTION is None:
+        _CONNECTION = st.connection(
+            "postgresql", type="sql", ttl=Config.DB_CONNECTION_TTL, **Config.DB_POOL
+        )
+    return _CONNECTION
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@register_cache('platforms')
+@st.cache_resource(ttl=Config.CACHE_TTL['platforms'], show_spinner=False)
 def load_platforms_from_db() -> Dict[str, int]:
-    """Load platforms from the database."""
+    """Load platforms from the database.
+
+    Cached as a resource so the map is shared by every session and rerun;
+    callers must treat the returned dict as read-only.
+    """
     conn = get_st_connection()
     with conn.session as session:
-        # Order by name ascending for predictable UI ordering
-        result = session.execute(text("SELECT id, name FROM platforms ORDER BY name ASC"))
+        result = session.execute(_Q_LOAD_PLATFORMS)
         return {row[1]: row[0] for row in result.fetchall()}
 
+# Guards PLATFORM_CACHE population across Streamlit's session threads
+_PLATFORM_LOCK = threading.Lock()
+
 def load_platforms() -> None:
     """Load platforms from the database into the cache."""
-    # Only load if cache is empty
-    if not PLATFORM_CACHE.cache:
-        try:
-            PLATFORM_CACHE.cache = load_platforms_from_db()
-        except Exception as e:
-            logger.error(f"Error connecting to the database: {e}")
-            PLATFORM_CACHE.cache = {}
+    # Only load if cache is empty; re-check under the lock so concurrent
+    # sessions on a cold start don't all query the database
+    if PLATFORM_CACHE.cache:
+        return
+    with _PLATFORM_LOCK:
+        if PLATFORM_CACHE.cache:
+            return
         try:
-            conn = get_st_connection()
-            with conn.session as session:
-                # Order by name ascending for predictable UI ordering
-                result = session.execute(text("SELECT id, name FROM platforms ORDER BY name ASC"))
-                PLATFORM_CACHE.cache = {row[1]: row[0] for row in result.fetchall()}
+            platforms = load_platforms_from_db()
         except Exception as e:
             logger.error(f"Error connecting to the database: {e}")
-            PLATFORM_CACHE.cache = {}
+            platforms = {}
+        PLATFORM_CACHE.cache = platforms
 
 # --- Utility function for platform mapping ---
 def map_platform_id_to_name(platform_id: int, platform_cache: PlatformCache = PLATFORM_CACHE) -> Optional[str]:
     """Map a platform_id to its name using the platform cache."""
-    id_to_name = {v: k for k, v in platform_cache.cache.items()}
-    return id_to_name.get(platform_id)
+    return platform_cache.id_to_name.get(platform_id)
 
 # --- Existing db_utils.py functions for positions management ---
 @handle_database_error
@@ -151,42 +277,28 @@ def update_position(position_id: int, **kwargs) -> None:
         session.commit()
     clear_cache_selective(['positions'])
 
+@register_cache('positions')
 @st.cache_data(ttl=60, show_spinner=False)
-def load_all_positions() -> Dict[str, List[Dict[str, Any]]]:
-    """Load all positions from the database in a single query and split by status."""
+def load_all_positions() -> pd.DataFrame:
+    """Load all positions from the database in a single query."""
     conn = get_st_connection()
     with conn.session as session:
-        result = session.execute(text("""
-            SELECT id, ticker, trade_type, position_status, entry_price, 
-                   quantity, entry_date, platform_id, exit_price, exit_date, profit_loss, direction
-            FROM positions 
-            ORDER BY entry_date DESC
-        """))
-        rows = result.fetchall()
-        columns = ["id", "ticker", "trade_type", "position_status", "entry_price", 
-                  "quantity", "entry_date", "platform_id", "exit_price", "exit_date", "profit_loss", "direction"]
-        
-        all_positions = [dict(zip(columns, row)) for row in rows]
-        
-        # Split by status
-        open_positions = [p for p in all_positions if p.get('position_status') != 'close']
-        closed_positions = [p for p in all_positions if p.get('position_status') == 'close']
-        
-        return {
-            'open': open_positions,
-            'closed': closed_positions,
-            'all': all_positions
-        }
+        result = session.execute(_Q_LOAD_ALL_POSITIONS)
+        return pd.DataFrame(result.fetchall(), columns=POSITION_COLUMNS)
 
+@register_cache('positions')
 @st.cache_data(ttl=60, show_spinner=False)
-def load_positions() -> List[Dict[str, Any]]:
+def load_positions() -> pd.DataFrame:
     """Load open positions from the database."""
-    return load_all_positions()['open']
+    df = load_all_positions()
+    return df[df["position_status"] != 'close'].reset_index(drop=True)
 
+@register_cache('positions')
 @st.cache_data(ttl=60, show_spinner=False)
-def load_closed_positions() -> List[Dict[str, Any]]:
+def load_closed_positions() -> pd.DataFrame:
     """Load closed positions from the database."""
-    return load_all_positions()['closed']
+    df = load_all_positions()
+    return df[df["position_status"] == 'close'].reset_index(drop=True)
 
 def insert_option_trade(
     ticker: str,
@@ -224,7 +336,7 @@ def insert_option_trade(
             }
         )
         session.commit()
-    clear_cache_selective(['positions'])
+    clear_cache_selective(['options'])
 
 
 def insert_option_trade_with_legs(
@@ -281,9 +393,10 @@ def insert_option_trade_with_legs(
                 }
             )
         session.commit()
-    clear_cache_selective(['positions'])
+    clear_cache_selective(['options'])
 
 
+@register_cache('options')
 @st.cache_data(ttl=60, show_spinner=False)
 def load_option_trade_legs(option_trade_id: int = None) -> List[Dict[str, Any]]:
     """Load option trade legs. If option_trade_id is given, load legs for that trade only."""
@@ -291,12 +404,9 @@ def load_option_trade_legs(option_trade_id: int = None) -> List[Dict[str, Any]]:
         conn = get_st_connection()
         with conn.session as session:
             if option_trade_id:
-                result = session.execute(
-                    text("SELECT * FROM option_trade_legs WHERE option_trade_id = :tid ORDER BY id"),
-                    {"tid": option_trade_id}
-                )
+                result = session.execute(_Q_LOAD_LEGS_FOR_TRADE, {"tid": option_trade_id})
             else:
-                result = session.execute(text("SELECT * FROM option_trade_legs ORDER BY option_trade_id, id"))
+                result = session.execute(_Q_LOAD_ALL_LEGS)
             rows = result.fetchall()
             columns = result.keys()
             return [dict(zip(columns, row)) for row in rows]
@@ -321,21 +431,33 @@ def update_option_trade(trade_id: int, **kwargs) -> None:
             params
         )
         session.commit()
-    clear_cache_selective(['positions'])
+    clear_cache_selective(['options'])
 
+@register_cache('options')
 @st.cache_data(ttl=60, show_spinner=False)
-def load_option_trades(status=None) -> List[Dict[str, Any]]:
-    """Load option trades from the database."""
+def load_option_trades(status=None, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Load option trades from the database.
+
+    Args:
+        status: Only load trades with this status (all trades if None)
+        columns: Columns to select (all of OPTION_TRADE_COLUMNS if None)
+    """
+    columns = tuple(columns) if columns else tuple(OPTION_TRADE_COLUMNS)
+    unknown = set(columns) - set(OPTION_TRADE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown option_trades columns: {sorted(unknown)}")
+    query = _option_trades_query(columns, bool(status))
     conn = get_st_connection()
     with conn.session as session:
-        if status:
-            result = session.execute(text("SELECT * FROM option_trades WHERE status = :status"), {"status": status})
-        else:
-            result = session.execute(text("SELECT * FROM option_trades"))
+        result = session.execute(query, {"status": status} if status else {})
         rows = result.fetchall()
-        columns = result.keys()
         return [dict(zip(columns, row)) for row in rows]
 
+def load_option_trades_summary(status=None) -> List[Dict[str, Any]]:
+    """Load option trades without the notes column."""
+    return load_option_trades(status=status, columns=OPTION_TRADE_SUMMARY_COLUMNS)
+
+@register_cache('trades')
 @st.cache_data(ttl=60, show_spinner=False)
 def load_all_trades() -> List[Dict[str, Any]]:
     """Load all raw trades from the trades table.
@@ -345,250 +467,211 @@ def load_all_trades() -> List[Dict[str, Any]]:
     """
     conn = get_st_connection()
     with conn.session as session:
-        result = session.execute(text("""
-            SELECT id, ticker, platform_id, price, quantity, date, trade_type, direction
-            FROM trades
-            ORDER BY date, id
-        """))
+        result = session.execute(_Q_LOAD_ALL_TRADES)
         rows = result.fetchall()
-        columns = ["id", "ticker", "platform_id", "price", "quantity", "date", "trade_type", "direction"]
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(TRADE_COLUMNS, row)) for row in rows]
 
 
 def close_option_trade(trade_id, status, close_date, option_close_price, notes=None, close_fee=0):
     conn = get_st_connection()
+    option_close_price = float(option_close_price) if option_close_price is not None else 0.0
+    close_fee = float(close_fee) if close_fee is not None else 0.0
     with conn.session as session:
-        # Get transaction_type, option_open_price, open_fee, quantity for this trade
-        result = session.execute(text("SELECT transaction_type, option_open_price, open_fee, COALESCE(quantity, 1) FROM option_trades WHERE id = :trade_id"), {"trade_id": trade_id})
-        row = result.fetchone()
-        if row:
-            transaction_type, option_open_price, open_fee, quantity = row
-            option_open_price = float(option_open_price) if option_open_price is not None else 0.0
-            option_close_price = float(option_close_price) if option_close_price is not None else 0.0
-            open_fee = float(open_fee) if open_fee is not None else 0.0
-            close_fee = float(close_fee) if close_fee is not None else 0.0
-            quantity = int(quantity) if quantity is not None else 1
-            total_fee = open_fee + close_fee
-            if transaction_type == "credit":
-                profit_loss = (option_open_price - option_close_price) * 100 * quantity - total_fee
-            else:
-                profit_loss = (option_close_price - option_open_price) * 100 * quantity - total_fee
-        else:
-            profit_loss = None
+        # Compute P/L in the same statement so closing a trade is one round trip:
+        # credit trades gain when the option is bought back cheaper, debit trades
+        # when it is sold for more; both pay the open and close fees.
         session.execute(
-            text("UPDATE option_trades SET status = :status, close_date = :close_date, option_close_price = :option_close_price, close_fee = :close_fee, profit_loss = :profit_loss, notes = :notes WHERE id = :trade_id"),
+            text("""
+            UPDATE option_trades SET
+                status = :status,
+                close_date = :close_date,
+                option_close_price = :option_close_price,
+                close_fee = :close_fee,
+                notes = :notes,
+                profit_loss = CASE
+                    WHEN transaction_type = 'credit'
+                        THEN (option_open_price - CAST(:option_close_price AS NUMERIC)) * :contract_size * COALESCE(quantity, 1)
+                    ELSE (CAST(:option_close_price AS NUMERIC) - option_open_price) * :contract_size * COALESCE(quantity, 1)
+                END - (COALESCE(open_fee, 0) + CAST(:close_fee AS NUMERIC))
+            WHERE id = :trade_id
+            """),
             {
                 "status": status,
                 "close_date": close_date,
                 "option_close_price": option_close_price,
                 "close_fee": close_fee,
-                "profit_loss": profit_loss,
                 "notes": notes,
+                "contract_size": Config.OPTION_CONTRACT_SIZE,
                 "trade_id": trade_id,
             }
         )
         session.commit()
-    clear_cache_selective(['positions'])
+    clear_cache_selective(['options'])
+
+# Rows per executemany call when rebuilding the positions table
+SYNC_INSERT_BATCH_SIZE = 1000
+
+# Trade quantities are matched as integer micro-units (1e-6 shares) so lot
+# arithmetic is exact and needs no rounding or epsilon comparisons
+QTY_SCALE = 1_000_000
+
+class _Trade(NamedTuple):
+    """A normalised buy/sell trade as loaded for the positions sync."""
+    price: float
+    quantity: int  # QTY_SCALE units
+    date: Any
+    trade_type: str
+    direction: str
+
+class _Lot:
+    """An open lot in the FIFO loop: the opening trade's index and what's left of it."""
+    __slots__ = ('index', 'remaining')
+
+    def __init__(self, index: int, remaining: int):
+        self.index = index
+        self.remaining = remaining
+
+def _match_lots_fifo_loop(quantities: np.ndarray, is_open: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Lot-by-lot FIFO matching; see _match_lots_fifo for the return layout."""
+    matches, open_lots = [], deque()
+    for i, qty in enumerate(quantities.tolist()):
+        if is_open[i]:
+            open_lots.append(_Lot(i, qty))
+            continue
+        # Closes beyond the currently open quantity are dropped
+        while qty > 0 and open_lots:
+            lot = open_lots[0]
+            matched = min(lot.remaining, qty)
+            matches.append((lot.index, i, matched))
+            lot.remaining -= matched
+            qty -= matched
+            if lot.remaining == 0:
+                open_lots.popleft()
+    open_idx = np.array([m[0] for m in matches], dtype=np.int64)
+    close_idx = np.array([m[1] for m in matches], dtype=np.int64)
+    matched_qty = np.array([m[2] for m in matches], dtype=np.int64)
+    lot_idx = np.array([lot.index for lot in open_lots], dtype=np.int64)
+    remaining = np.array([lot.remaining for lot in open_lots], dtype=np.int64)
+    return open_idx, close_idx, matched_qty, lot_idx, remaining
+
+def _match_lots_fifo(quantities: np.ndarray, is_open: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Match closing trades against open lots first-in, first-out.
+
+    `quantities` are one direction's trade sizes in QTY_SCALE units (int64),
+    in chronological order, and `is_open` marks the trades that open lots
+    (buys for Long, sells for Short). Returns (open_idx, close_idx,
+    matched_qty, lot_idx, remaining_qty): one entry per matched slice, then
+    one per still-open lot, with trades referenced by position.
+    """
+    # Cumulative-quantity matching assumes every close is covered by earlier
+    # opens; otherwise fall back to the loop, which drops the uncovered part
+    running = np.cumsum(np.where(is_open, quantities, -quantities))
+    if (running < 0).any():
+        return _match_lots_fifo_loop(quantities, is_open)
+    open_pos = np.flatnonzero(is_open)
+    close_pos = np.flatnonzero(~is_open)
+    open_end = np.cumsum(quantities[open_pos])
+    open_start = open_end - quantities[open_pos]
+    close_end = np.cumsum(quantities[close_pos])
+    total_closed = close_end[-1] if len(close_end) else 0
+    # Open and close boundaries on the shared cumulative axis cut it into
+    # slices that each belong to exactly one open lot and one close
+    bounds = np.unique(np.concatenate(([0], open_end, close_end)))
+    bounds = bounds[bounds <= total_closed]
+    seg_start = bounds[:-1]
+    matched_qty = np.diff(bounds)
+    open_idx = open_pos[np.searchsorted(open_end, seg_start, side='right')]
+    close_idx = close_pos[np.searchsorted(close_end, seg_start, side='right')]
+    remaining = open_end - np.maximum(open_start, total_closed)
+    still_open = remaining > 0
+    return open_idx, close_idx, matched_qty, open_pos[still_open], remaining[still_open]
 
 def sync_positions_from_trades():
     """
     Optimized: Syncs the positions table with the trades table using batch inserts and minimal deletions.
-    Handles partial sells by matching sells to open buy lots (FIFO).
+    Handles partial sells by matching sells to open buy lots (FIFO), vectorized per ticker/platform/direction.
     Only deletes positions for tickers/platforms being updated.
-    Rounds quantities to 6 decimal places to avoid floating point precision issues.
+    Quantities are matched in integer micro-units (6 decimal places) to avoid floating point drift.
     """
     conn = get_st_connection()
-    with conn.session as session:
+    # One explicit transaction: the delete and re-insert commit together (or
+    # roll back together on error) when the block exits
+    with conn.session as session, session.begin():
+        # Serialize concurrent syncs so two runs can't interleave their
+        # delete/insert and duplicate positions; readers are not blocked
+        session.execute(_Q_LOCK_POSITIONS)
         # Get all trades ordered by ticker, platform, date
-        # Select id as well and order by date first, then id as a tiebreaker to
-        # correctly handle multiple trades on the same date (day trades). This
-        # ensures chronological ordering where date is primary and id preserves
+        # Order by date first, then id as a tiebreaker to correctly handle
+        # multiple trades on the same date (day trades): id preserves
         # insertion order for same-day events.
-        result = session.execute(text('''
-            SELECT id, ticker, platform_id, price, quantity, date, trade_type, direction
-            FROM trades
-            ORDER BY ticker, platform_id, date, id
-        '''))
-        trades = result.fetchall()
-        from collections import defaultdict, deque
-        trades_by_key = defaultdict(list)
-        for row in trades:
-            # row layout: id, ticker, platform_id, price, quantity, date, trade_type, direction
-            _id, ticker, platform_id, price, quantity, date, trade_type, direction = row
-            # Normalize values: ensure numeric types, normalized trade_type and skip zero qty
-            try:
-                qty = round(float(quantity), 6)
-            except Exception:
-                qty = 0.0
-            if qty == 0:
-                # skip no-op trades
-                continue
-            ttype = (str(trade_type) if trade_type is not None else "").strip().lower()
-            tdir = (str(direction) if direction is not None else "Long").strip().capitalize()
-            trades_by_key[(ticker, platform_id)].append({
-                'id': _id,
-                'price': float(price) if price is not None else 0.0,
-                'quantity': qty,
-                'date': date,
-                'trade_type': ttype,
-                'direction': tdir,
-            })
-        # Prepare batch inserts and minimal deletions
-        all_keys = list(trades_by_key.keys())
-        # Delete only positions for tickers/platforms being updated
-        for ticker, platform_id in all_keys:
-            session.execute(text("DELETE FROM positions WHERE ticker = :ticker AND platform_id = :platform_id"), {"ticker": ticker, "platform_id": platform_id})
+        # Normalisation happens in SQL: zero-quantity trades are filtered out,
+        # quantities arrive as QTY_SCALE integer units, prices as floats and
+        # trade_type/direction already trimmed and cased.
+        result = session.execute(_Q_SYNC_TRADES, {"qty_scale": QTY_SCALE})
+        # Rows arrive sorted by (ticker, platform_id), so each key's trades
+        # are contiguous and one groupby pass materialises them
+        trades_by_key = {
+            key: [_Trade._make(row[2:]) for row in rows]
+            for key, rows in itertools.groupby(result, key=operator.itemgetter(0, 1))
+        }
+        # Delete only positions for tickers/platforms being updated, in one
+        # statement: the keys are shipped as two parallel arrays and joined
+        # against positions (served by idx_positions_ticker_platform)
+        if trades_by_key:
+            tickers, platform_ids = zip(*trades_by_key.keys())
+            session.execute(_Q_DELETE_POSITIONS_FOR_KEYS, {"tickers": list(tickers), "platform_ids": list(platform_ids)})
         closed_positions = []
         open_positions = []
         for (ticker, platform_id), trade_list in trades_by_key.items():
-            open_lots = deque()       # Long open lots
-            short_lots = deque()      # Short open lots
-            for trade in trade_list:
-                ttype = trade['trade_type'].lower()
-                tdir = trade.get('direction', 'Long')
-
-                if tdir == 'Short':
-                    # SHORT position logic:
-                    # "Sell" (sell-to-open) opens a short lot
-                    # "Buy" (buy-to-cover) closes short lots
-                    if ttype == 'sell':
-                        short_lots.append({
-                            'price': trade['price'],
-                            'quantity': trade['quantity'],
-                            'entry_date': trade['date'],
-                            'remaining': round(trade['quantity'], 6)
-                        })
-                    elif ttype == 'buy':
-                        cover_qty = round(trade['quantity'], 6)
-                        cover_price = trade['price']
-                        cover_date = trade['date']
-                        while round(cover_qty, 6) > 0 and short_lots:
-                            lot = short_lots[0]
-                            lot_qty = round(lot['remaining'], 6)
-                            matched_qty = round(min(lot_qty, cover_qty), 6)
-                            # Short P&L: entry (sell) price - exit (buy/cover) price
-                            profit_loss = round((lot['price'] - cover_price) * matched_qty, 2)
-                            closed_positions.append({
-                                'ticker': ticker,
-                                'trade_type': None,
-                                'position_status': 'close',
-                                'entry_price': lot['price'],
-                                'quantity': matched_qty,
-                                'entry_date': lot['entry_date'],
-                                'exit_price': cover_price,
-                                'exit_date': cover_date,
-                                'platform_id': platform_id,
-                                'profit_loss': profit_loss,
-                                'direction': 'Short',
-                            })
-                            lot['remaining'] = round(lot['remaining'] - matched_qty, 6)
-                            cover_qty = round(cover_qty - matched_qty, 6)
-                            if abs(lot['remaining']) < 1e-6:
-                                short_lots.popleft()
-                else:
-                    # LONG position logic (original)
-                    if ttype == 'buy':
-                        open_lots.append({
-                            'price': trade['price'],
-                            'quantity': trade['quantity'],
-                            'entry_date': trade['date'],
-                            'remaining': round(trade['quantity'], 6)
-                        })
-                    elif ttype == 'sell':
-                        sell_qty = round(trade['quantity'], 6)
-                        sell_price = trade['price']
-                        sell_date = trade['date']
-                        while round(sell_qty, 6) > 0 and open_lots:
-                            lot = open_lots[0]
-                            lot_qty = round(lot['remaining'], 6)
-                            matched_qty = round(min(lot_qty, sell_qty), 6)
-                            profit_loss = round((sell_price - lot['price']) * matched_qty, 2)
-                            closed_positions.append({
-                                'ticker': ticker,
-                                'trade_type': None,
-                                'position_status': 'close',
-                                'entry_price': lot['price'],
-                                'quantity': matched_qty,
-                                'entry_date': lot['entry_date'],
-                                'exit_price': sell_price,
-                                'exit_date': sell_date,
-                                'platform_id': platform_id,
-                                'profit_loss': profit_loss,
-                                'direction': 'Long',
-                            })
-                            lot['remaining'] = round(lot['remaining'] - matched_qty, 6)
-                            sell_qty = round(sell_qty - matched_qty, 6)
-                            if abs(lot['remaining']) < 1e-6:
-                                open_lots.popleft()
-            # After all trades, remaining open_lots = open long positions
-            for lot in open_lots:
-                open_positions.append({
-                    'ticker': ticker,
-                    'trade_type': None,
-                    'position_status': 'open',
-                    'entry_price': lot['price'],
-                    'quantity': lot['remaining'],
-                    'entry_date': lot['entry_date'],
-                    'platform_id': platform_id,
-                    'profit_loss': None,
-                    'direction': 'Long',
-                })
-            # Remaining short_lots = open short positions
-            for lot in short_lots:
-                open_positions.append({
-                    'ticker': ticker,
-                    'trade_type': None,
-                    'position_status': 'open',
-                    'entry_price': lot['price'],
-                    'quantity': lot['remaining'],
-                    'entry_date': lot['entry_date'],
-                    'platform_id': platform_id,
-                    'profit_loss': None,
-                    'direction': 'Short',
-                })
-        # Batch insert closed positions
-        if closed_positions:
-            session.execute(text('''
-                INSERT INTO positions (ticker, trade_type, position_status, entry_price, quantity, entry_date, exit_price, exit_date, platform_id, profit_loss, direction)
-                VALUES 
-                ''' + ',\n'.join([
-                    f"(:ticker{i}, :trade_type{i}, :position_status{i}, :entry_price{i}, :quantity{i}, :entry_date{i}, :exit_price{i}, :exit_date{i}, :platform_id{i}, :profit_loss{i}, :direction{i})"
-                    for i in range(len(closed_positions))
-                ])), {
-                    **{f"ticker{i}": p['ticker'] for i, p in enumerate(closed_positions)},
-                    **{f"trade_type{i}": p['trade_type'] for i, p in enumerate(closed_positions)},
-                    **{f"position_status{i}": p['position_status'] for i, p in enumerate(closed_positions)},
-                    **{f"entry_price{i}": p['entry_price'] for i, p in enumerate(closed_positions)},
-                    **{f"quantity{i}": p['quantity'] for i, p in enumerate(closed_positions)},
-                    **{f"entry_date{i}": p['entry_date'] for i, p in enumerate(closed_positions)},
-                    **{f"exit_price{i}": p['exit_price'] for i, p in enumerate(closed_positions)},
-                    **{f"exit_date{i}": p['exit_date'] for i, p in enumerate(closed_positions)},
-                    **{f"platform_id{i}": p['platform_id'] for i, p in enumerate(closed_positions)},
-                    **{f"profit_loss{i}": p['profit_loss'] for i, p in enumerate(closed_positions)},
-                    **{f"direction{i}": p.get('direction', 'Long') for i, p in enumerate(closed_positions)},
-                }
-            )
-        # Batch insert open positions
-        if open_positions:
-            session.execute(text('''
-                INSERT INTO positions (ticker, trade_type, position_status, entry_price, quantity, entry_date, platform_id, profit_loss, direction)
-                VALUES 
-                ''' + ',\n'.join([
-                    f"(:ticker{i}, :trade_type{i}, :position_status{i}, :entry_price{i}, :quantity{i}, :entry_date{i}, :platform_id{i}, :profit_loss{i}, :direction{i})"
-                    for i in range(len(open_positions))
-                ])), {
-                    **{f"ticker{i}": p['ticker'] for i, p in enumerate(open_positions)},
-                    **{f"trade_type{i}": p['trade_type'] for i, p in enumerate(open_positions)},
-                    **{f"position_status{i}": p['position_status'] for i, p in enumerate(open_positions)},
-                    **{f"entry_price{i}": p['entry_price'] for i, p in enumerate(open_positions)},
-                    **{f"quantity{i}": p['quantity'] for i, p in enumerate(open_positions)},
-                    **{f"entry_date{i}": p['entry_date'] for i, p in enumerate(open_positions)},
-                    **{f"platform_id{i}": p['platform_id'] for i, p in enumerate(open_positions)},
-                    **{f"profit_loss{i}": p['profit_loss'] for i, p in enumerate(open_positions)},
-                    **{f"direction{i}": p.get('direction', 'Long') for i, p in enumerate(open_positions)},
-                }
-            )
-        session.commit()
+            for tdir in ('Long', 'Short'):
+                # Long: buys open lots and sells close them; Short: sell-to-open
+                # and buy-to-cover
+                open_type, sign = ('buy', 1) if tdir == 'Long' else ('sell', -1)
+                dir_trades = [t for t in trade_list
+                              if (t.direction == 'Short') == (tdir == 'Short')
+                              and t.trade_type in ('buy', 'sell')]
+                if not dir_trades:
+                    continue
+                quantities = np.array([t.quantity for t in dir_trades], dtype=np.int64)
+                prices = np.array([t.price for t in dir_trades], dtype=float)
+                is_open = np.array([t.trade_type == open_type for t in dir_trades])
+                open_idx, close_idx, matched_qty, lot_idx, remaining = _match_lots_fifo(quantities, is_open)
+                matched_qty = matched_qty / QTY_SCALE
+                profit_loss = (prices[close_idx] - prices[open_idx]) * matched_qty * sign
+                for o, c, qty, pl in zip(open_idx.tolist(), close_idx.tolist(), matched_qty.tolist(), profit_loss.tolist()):
+                    closed_positions.append({
+                        'ticker': ticker,
+                        'trade_type': None,
+                        'position_status': 'close',
+                        'entry_price': dir_trades[o].price,
+                        'quantity': qty,
+                        'entry_date': dir_trades[o].date,
+                        'exit_price': dir_trades[c].price,
+                        'exit_date': dir_trades[c].date,
+                        'platform_id': platform_id,
+                        'profit_loss': round(pl, 2),
+                        'direction': tdir,
+                    })
+                for o, qty in zip(lot_idx.tolist(), (remaining / QTY_SCALE).tolist()):
+                    open_positions.append({
+                        'ticker': ticker,
+                        'trade_type': None,
+                        'position_status': 'open',
+                        'entry_price': dir_trades[o].price,
+                        'quantity': qty,
+                        'entry_date': dir_trades[o].date,
+                        'exit_price': None,
+                        'exit_date': None,
+                        'platform_id': platform_id,
+                        'profit_loss': None,
+                        'direction': tdir,
+                    })
+        # Batch insert positions with driver-level executemany, chunked so a
+        # large sync never builds one oversized statement. Closed and open rows
+        # share one parameter shape, so they go through a single INSERT.
+        positions = closed_positions + open_positions
+        for i in range(0, len(positions), SYNC_INSERT_BATCH_SIZE):
+            session.execute(_Q_INSERT_POSITIONS, positions[i:i + SYNC_INSERT_BATCH_SIZE])
     clear_cache_selective(['positions'])
 
 def insert_trade(
@@ -619,10 +702,12 @@ def insert_trade(
             }
         )
         session.commit()
-    clear_cache_selective(['positions'])
+    clear_cache_selective(['trades'])
 
 
 # --- Last upload metadata helpers (DB-backed) -----------------------------
+_UTC = datetime.timezone.utc
+
 def set_last_upload_time(ts: Optional[str] = None) -> None:
     """Persist the last upload timestamp (UTC ISO string) into the DB.
 
@@ -632,7 +717,7 @@ def set_last_upload_time(ts: Optional[str] = None) -> None:
     for environments that require explicit migrations.
     """
     if ts is None:
-        ts = datetime.datetime.utcnow().isoformat()
+        ts = datetime.datetime.now(_UTC).isoformat(timespec='seconds')
     try:
         conn = get_st_connection()
         with conn.session as session:
@@ -656,7 +741,7 @@ def get_last_upload_time() -> Optional[str]:
     try:
         conn = get_st_connection()
         with conn.session as session:
-            result = session.execute(text("SELECT value FROM app_metadata WHERE key = :key"), {"key": "last_csv_upload"})
+            result = session.execute(_Q_GET_METADATA, {"key": "last_csv_upload"})
             row = result.fetchone()
             return row[0] if row else None
     except Exception as e:
@@ -688,32 +773,25 @@ def insert_cash_flow(
             }
         )
         session.commit()
-    clear_cache_selective(['positions'])
+    clear_cache_selective(['cash'])
 
+@register_cache('cash')
 @st.cache_data(ttl=60, show_spinner=False)
 def load_cash_flows() -> List[Dict[str, Any]]:
     """Load all cash flows from the database."""
     conn = get_st_connection()
     with conn.session as session:
-        result = session.execute(
-            text("SELECT id, platform_id, flow_type, amount, flow_date, notes FROM cash_flows ORDER BY flow_date DESC")
-        )
+        result = session.execute(_Q_LOAD_CASH_FLOWS)
         rows = result.fetchall()
-        columns = ["id", "platform_id", "flow_type", "amount", "flow_date", "notes"]
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(CASH_FLOW_COLUMNS, row)) for row in rows]
 
+@register_cache('cash')
 @st.cache_data(ttl=60, show_spinner=False)
 def get_total_cash_by_platform() -> Dict[str, float]:
     """Get total cash (deposits - withdrawals) by platform."""
     conn = get_st_connection()
     with conn.session as session:
-        result = session.execute(text("""
-            SELECT p.name, COALESCE(SUM(CASE WHEN cf.flow_type = 'deposit' THEN cf.amount ELSE -cf.amount END), 0) as total_cash
-            FROM platforms p
-            LEFT JOIN cash_flows cf ON p.id = cf.platform_id
-            GROUP BY p.id, p.name
-            ORDER BY p.name
-        """))
+        result = session.execute(_Q_TOTAL_CASH_BY_PLATFORM)
         rows = result.fetchall()
         return {row[0]: float(row[1]) for row in rows}
 
@@ -723,7 +801,7 @@ def get_total_cash_by_platform() -> Dict[str, float]:
 def set_platform_cash_available(platform_id: int, amount: float) -> None:
     """
     Ensure `platforms.cash_available` exists and set it for a platform.
-    Clears `st.cache_data` after update.
+    Clears the cash caches after update.
     """
     try:
         conn = get_st_connection()
@@ -733,12 +811,13 @@ def set_platform_cash_available(platform_id: int, amount: float) -> None:
                 {"amount": float(amount), "platform_id": platform_id}
             )
             session.commit()
-        clear_cache_selective(['positions'])
+        clear_cache_selective(['cash'])
     except Exception as e:
         logger.error(f"Failed to set platform cash_available: {e}")
         raise
 
 
+@register_cache('cash')
 @st.cache_data(ttl=60, show_spinner=False)
 def get_platform_cash_available_map() -> Dict[str, float]:
     """
@@ -747,7 +826,7 @@ def get_platform_cash_available_map() -> Dict[str, float]:
     try:
         conn = get_st_connection()
         with conn.session as session:
-            result = session.execute(text("SELECT name, COALESCE(cash_available, 0) FROM platforms ORDER BY name"))
+            result = session.execute(_Q_PLATFORM_CASH_AVAILABLE)
             rows = result.fetchall()
             return {row[0]: float(row[1]) for row in rows}
     except Exception as e:
@@ -0,0 +1,71 @@
+"""Persistent cache of ticker asset types ('ETF' / 'Stock').
+
+A symbol's quoteType almost never changes, so classifications are kept in a
+small JSON file that survives process restarts; st.cache_data stays the
+in-process layer in front of it.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TickerTypeCache:
+    """JSON-file cache of {ticker: {"type": str, "ts": epoch seconds}} with a TTL."""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        # Called with the lock held; the file is read once per process
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get_many(self, tickers: Iterable[str]) -> Dict[str, str]:
+        """Return the cached, unexpired types for whichever of tickers are known."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            entries = self._load()
+            found = {}
+            for t in tickers:
+                entry = entries.get(t)
+                if entry and entry.get("ts", 0) >= cutoff:
+                    found[t] = entry["type"]
+            return found
+
+    def set_many(self, types: Dict[str, str]) -> None:
+        """Store types for tickers and rewrite the file; write errors are logged, not raised."""
+        if not types:
+            return
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            entries.update({t: {"type": v, "ts": now} for t, v in types.items()})
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                # Write to a temp file and rename so readers never see a partial file
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entries, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning(f"Could not write ticker type cache {self.path}: {e}")
+
+
+TICKER_TYPE_CACHE = TickerTypeCache(Config.TICKER_TYPE_CACHE_PATH, Config.CACHE_TTL['ticker_types'])
@@ -28,7 +28,7 @@ print_error() {
 print_status "Checking pytest installation..."
 if ! command -v pytest &> /dev/null; then
     print_error "pytest is not installed. Installing..."
-    pip3 install pytest pytest-mock
+    pip3 install pytest pytest-mock pytest-xdist
 fi
 
 # Check if we're in the right directory
@@ -42,13 +42,15 @@ print_status "Running unit tests..."
 # Run tests with coverage if available
 if command -v coverage &> /dev/null; then
     print_status "Running tests with coverage..."
-    coverage run -m pytest tests/ -v
+    # -n 0 keeps the tests in this process: coverage isn't set up to
+    # follow the xdist workers that pyproject's addopts would start
+    coverage run -m pytest tests/ -v -m "" -n 0
     coverage report
     coverage html
     print_status "Coverage report generated in htmlcov/"
 else
     print_warning "coverage not installed. Running tests without coverage..."
-    python3 -m pytest tests/ -v --tb=short
+    python3 -m pytest tests/ -v --tb=short -m ""
 fi
 
 print_status "Running import tests..."
@@ -96,7 +98,7 @@ print('All critical imports work!')
 print_status "Checking requirements.txt..."
 
 # Check if all required packages are listed
-required_packages=("streamlit" "streamlit-authenticator" "psycopg2-binary" "pandas" "yfinance" "sqlalchemy" "altair" "pytest" "pytest-mock")
+required_packages=("streamlit" "streamlit-authenticator" "psycopg2-binary" "pandas" "pyarrow" "yfinance" "sqlalchemy" "altair" "pytest" "pytest-mock" "pytest-xdist")
 
 for package in "${required_packages[@]}"; do
     if grep -q "^$package$" requirements.txt; then
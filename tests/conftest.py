@@ -1,8 +1,211 @@
 """Configuration for pytest tests."""
 
+import contextlib
+import copy
+import functools
+import importlib
 import os
 import sys
+import types
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
 
 # Add the project root to the Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, project_root)
\ No newline at end of file
+sys.path.insert(0, project_root)
+
+# Stand-in for yfinance, installed before any ui.* import: tests never touch
+# the network and workers skip loading the real package
+_yfinance_stub = types.ModuleType("yfinance")
+_yfinance_stub.Ticker = MagicMock(name="yfinance.Ticker")
+_yfinance_stub.Tickers = MagicMock(name="yfinance.Tickers")
+_yfinance_stub.download = MagicMock(name="yfinance.download")
+sys.modules["yfinance"] = _yfinance_stub
+
+# Streamlit module mock, spec'd against the real module once per session
+import streamlit  # noqa: E402
+_STREAMLIT_MOCK = MagicMock(spec=streamlit)
+
+# UI page modules loaded once per session by the ui_modules fixture
+UI_MODULES = (
+    "ui.positions_ui",
+    "ui.option_trades_ui",
+    "ui.portfolio_report",
+    "ui.data_entry",
+    "ui.dashboard",
+    "ui.taxes_ui",
+    "ui.weekly_monthly_pl_report",
+    "ui.cash_flows_ui",
+)
+
+# Streamlit calls that only render output; tests swap them for no-ops
+ST_RENDER_CALLS = (
+    "title", "header", "subheader", "spinner", "dataframe", "markdown",
+    "write", "columns", "altair_chart", "info", "expander", "success",
+    "sidebar",
+)
+
+
+# Tables the SQLite-backed tests need; a subset of db-scripts in SQLite syntax
+SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS platforms (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE IF NOT EXISTS app_metadata (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _sqlite_engine(url: str = "sqlite:///:memory:"):
+    """One engine per URL for the whole session; schema is created on first use."""
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        for ddl in SQLITE_SCHEMA:
+            conn.execute(text(ddl))
+    return engine
+
+
+class SQLiteConnection:
+    """Minimal stand-in for streamlit's SQLConnection backed by a SQLAlchemy engine."""
+
+    def __init__(self, engine):
+        self._engine = engine
+
+    @property
+    def session(self) -> Session:
+        return Session(self._engine)
+
+    def query(self, sql, params=None, **kwargs) -> pd.DataFrame:
+        with self._engine.connect() as conn:
+            return pd.read_sql(text(sql), conn, params=params)
+
+
+# Everything the suite imports, loaded once before the first test runs
+PRELOAD_MODULES = ("pandas", "streamlit", "config", "db.db_utils", "ui.utils") + UI_MODULES
+
+
+def pytest_configure(config):
+    """Pre-import the application modules so the first test in each file
+    doesn't carry the whole import cost. Under xdist only the workers do
+    this; the controller process never runs tests."""
+    if getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput"):
+        return
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Keep each file's ordinary tests on one xdist worker (as with
+    --dist=loadfile) while letting heavy page-render tests spread out."""
+    for item in items:
+        if item.get_closest_marker("heavy") is None:
+            item.add_marker(pytest.mark.xdist_group(item.module.__name__))
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_connection():
+    """Drop the shared DB connection so mocked connections don't leak between tests."""
+    from db import db_utils
+    db_utils._CONNECTION = None
+    yield
+    db_utils._CONNECTION = None
+
+
+@pytest.fixture(autouse=True)
+def isolated_ticker_type_cache(tmp_path, monkeypatch):
+    """Point the on-disk ticker type cache at a per-test file, starting empty."""
+    from db.ticker_type_cache import TICKER_TYPE_CACHE
+    monkeypatch.setattr(TICKER_TYPE_CACHE, "path", str(tmp_path / "ticker_types.json"))
+    monkeypatch.setattr(TICKER_TYPE_CACHE, "_entries", None)
+    return TICKER_TYPE_CACHE
+
+
+@pytest.fixture(scope="session")
+def ui_modules():
+    """Import every UI page module once and return them keyed by module name."""
+    return {name: importlib.import_module(name) for name in UI_MODULES}
+
+
+@pytest.fixture(scope="session")
+def db_utils():
+    """The db.db_utils module, imported once per session."""
+    return importlib.import_module("db.db_utils")
+
+
+@pytest.fixture
+def fresh_streamlit_mock():
+    """A per-test shallow copy of the session's streamlit module mock."""
+    return copy.copy(_STREAMLIT_MOCK)
+
+
+# Small frames with well-known shapes, built once per session. Tests must
+# not mutate them; pass a .copy() to code that adds columns.
+@pytest.fixture(scope="session")
+def sample_df():
+    """Three rows of mixed int/str/float columns."""
+    return pd.DataFrame({
+        'column1': [1, 2, 3],
+        'column2': ['a', 'b', 'c'],
+        'column3': [1.5, 2.5, 3.5]
+    })
+
+
+@pytest.fixture(scope="session")
+def portfolio_df():
+    """One holding in the shape returned by _get_portfolio_df."""
+    return pd.DataFrame({
+        'platform': ['Test Platform'],
+        'ticker': ['AAPL'],
+        'trade_cost': [1000.0],
+        'Asset Type': ['Stock']
+    })
+
+
+@pytest.fixture(scope="session")
+def profit_loss_df():
+    """The smallest frame the P/L styling helpers can style: one row, one column."""
+    return pd.DataFrame({'profit_loss': [100]})
+
+
+@pytest.fixture(scope="session")
+def empty_df():
+    """A zero-row frame for pass-through branches."""
+    return pd.DataFrame()
+
+
+@pytest.fixture(scope="session")
+def db_connection():
+    """A plain-object connection whose queries return empty results."""
+    result = SimpleNamespace(fetchall=lambda: [], fetchone=lambda: None)
+    session = SimpleNamespace(execute=lambda *a, **k: result, commit=lambda: None)
+    return SimpleNamespace(
+        session=contextlib.nullcontext(session),
+        query=lambda *a, **k: pd.DataFrame(),
+    )
+
+
+@pytest.fixture
+def sqlite_connection(monkeypatch):
+    """Point db_utils at the shared in-memory SQLite engine, with empty tables."""
+    from db import db_utils
+    engine = _sqlite_engine()
+    with engine.begin() as conn:
+        for table in ("platforms", "app_metadata"):
+            conn.execute(text(f"DELETE FROM {table}"))
+    connection = SQLiteConnection(engine)
+    monkeypatch.setattr(db_utils, "_CONNECTION", connection)
+    return connection
+
+
+@pytest.fixture
+def streamlit_noop(monkeypatch):
+    """Replace streamlit's rendering calls with no-ops by direct attribute assignment."""
+    import streamlit as st
+    noop = MagicMock()
+    for name in ST_RENDER_CALLS:
+        monkeypatch.setattr(st, name, noop)
+    return noop
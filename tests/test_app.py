@@ -3,7 +3,11 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import sys
-import importlib
+
+EXPECTED_NAV_KEYS = frozenset({
+    "Dashboard", "Portfolio", "Positions", "Option Trades",
+    "Weekly & Monthly P/L Report", "Cash Flows", "Taxes", "Data Entry"
+})
 
 
 class TestAppImports:
@@ -19,70 +23,40 @@ class TestAppImports:
         from db.db_utils import load_platforms
         assert load_platforms is not None
     
-    @patch('streamlit.connection')
-    def test_connection_pool_creation(self, mock_connection):
-        """Test that connection pool is created correctly."""
-        # Mock streamlit connection
-        mock_conn = MagicMock()
-        mock_connection.return_value = mock_conn
-        
-        # Import app which should create the connection pool
-        with patch.dict('sys.modules', {'streamlit': MagicMock()}):
-            with patch('app.st.connection', mock_connection):
-                # This should not raise an ImportError
-                try:
-                    import app
-                    assert hasattr(app, 'CONNECTION_POOL')
-                except ImportError as e:
-                    pytest.fail(f"Failed to import app: {e}")
+    def test_import_opens_no_connection(self, fresh_streamlit_mock, monkeypatch):
+        """Test that importing app does not open a database connection."""
+        # Import app with streamlit mocked out; the copy shares its children
+        # with the session mock, so give it a connection of its own
+        monkeypatch.setattr(fresh_streamlit_mock, 'connection', MagicMock())
+        monkeypatch.setitem(sys.modules, 'streamlit', fresh_streamlit_mock)
+        monkeypatch.delitem(sys.modules, 'app', raising=False)
+        try:
+            import app
+            assert not hasattr(app, 'CONNECTION_POOL')
+            fresh_streamlit_mock.connection.assert_not_called()
+        finally:
+            # Don't leave an app bound to the mock behind for later tests
+            sys.modules.pop('app', None)
     
-    def test_ui_modules_import(self):
+    def test_ui_modules_import(self, ui_modules):
         """Test that all UI modules can be imported."""
-        ui_modules = [
-            'ui.positions_ui',
-            'ui.option_trades_ui', 
-            'ui.portfolio_report',
-            'ui.data_entry',
-            'ui.dashboard',
-            'ui.taxes_ui',
-            'ui.weekly_monthly_pl_report',
-            'ui.cash_flows_ui'
-        ]
-        
-        for module_name in ui_modules:
-            try:
-                import importlib
-                module = importlib.import_module(module_name)
-                assert module is not None
-            except ImportError as e:
-                pytest.fail(f"Failed to import {module_name}: {e}")
+        assert len(ui_modules) == 8
+        assert None not in ui_modules.values()
     
     def test_navigation_config(self):
         """Test that navigation configuration is properly defined."""
-        # Test that we can access the navigation config
-        expected_keys = [
-            "Dashboard", "Portfolio", "Positions", "Option Trades",
-            "Weekly & Monthly P/L Report", "Cash Flows", "Taxes", "Data Entry"
-        ]
-        
         # Mock app imports to test just the navigation part
         with patch('streamlit.set_page_config'):
             with patch('streamlit.connection'):
-                try:
-                    import app
-                    nav = app.NAVIGATION
-                    
-                    assert isinstance(nav, dict)
-                    assert len(nav) == 8
-                    
-                    for key in expected_keys:
-                        assert key in nav
-                        assert isinstance(nav[key], str)
-                        assert len(nav[key]) > 0
-                        
-                except ImportError:
-                    # Skip if app can't be fully imported due to dependencies
-                    pass
+                # Skip if app can't be fully imported due to dependencies
+                app = pytest.importorskip("app")
+                nav = app.NAVIGATION
+                
+                assert isinstance(nav, dict)
+                assert len(nav) == 8
+                
+                assert EXPECTED_NAV_KEYS <= nav.keys()
+                assert all(isinstance(v, str) and v for v in nav.values())
     
     @pytest.mark.skip(reason="Auth function requires complex mocking that's not essential for deployment")
     def test_auth_function_basic(self):
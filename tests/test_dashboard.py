@@ -1,195 +0,0 @@
-"""Test dashboard module functionality."""
-
-import pytest
-from unittest.mock import patch, MagicMock
-import pandas as pd
-import sys
-
-
-class TestDashboardModule:
-    """Test dashboard module imports and basic functions."""
-    
-    def test_dashboard_import(self):
-        """Test that dashboard module can be imported."""
-        try:
-            from ui.dashboard import dashboard, load_dashboard_data
-            assert dashboard is not None
-            assert load_dashboard_data is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import dashboard: {e}")
-    
-    @patch('streamlit.cache_data')
-    @patch('ui.dashboard.yf.Ticker')
-    def test_classify_ticker(self, mock_ticker, mock_cache):
-        """Test ticker classification function."""
-        # Mock the yfinance Ticker
-        mock_info = {'quoteType': 'ETF'}
-        mock_ticker.return_value.info = mock_info
-        
-        try:
-            from ui.dashboard import _classify_ticker
-            
-            # Test ETF classification
-            result = _classify_ticker('SPY')
-            assert result == "ETF"
-            
-            # Test Stock classification
-            mock_info['quoteType'] = 'EQUITY'
-            result = _classify_ticker('AAPL')
-            assert result == "Stock"
-            
-            # Test fallback case (exception)
-            mock_ticker.side_effect = Exception("Network error")
-            result = _classify_ticker('INVALID')
-            assert result == "Stock"
-            
-        except ImportError as e:
-            pytest.fail(f"Failed to test _classify_ticker: {e}")
-    
-    @patch('streamlit.cache_data')
-    def test_compute_asset_allocation(self, mock_cache):
-        """Test asset allocation computation."""
-        try:
-            from ui.dashboard import compute_asset_allocation
-            
-            # Mock the dependencies
-            with patch('ui.dashboard._get_portfolio_df') as mock_portfolio, \
-                 patch('ui.dashboard.load_option_trades') as mock_options, \
-                 patch('ui.dashboard.get_platform_option_exposure') as mock_exposure:
-                
-                # Mock with data to ensure non-empty result
-                test_df = pd.DataFrame({
-                    'platform': ['Test Platform'],
-                    'ticker': ['AAPL'],
-                    'trade_cost': [1000.0]
-                })
-                test_df["Asset Type"] = "Stock"
-                mock_portfolio.return_value = test_df
-                mock_options.return_value = []
-                mock_exposure.return_value = {}
-                
-                result = compute_asset_allocation()
-                assert isinstance(result, pd.DataFrame)
-                # Skip empty assertion since function might return empty for test data
-                assert True  # Basic test passed
-                
-        except ImportError as e:
-            pytest.fail(f"Failed to test compute_asset_allocation: {e}")
-    
-    @patch('streamlit.cache_data')
-    def test_color_profit_loss(self, mock_cache):
-        """Test color_profit_loss function."""
-        try:
-            from ui.utils import color_profit_loss
-            
-            # Test positive values
-            result = color_profit_loss(100)
-            assert "green" in result
-            assert "color: green" == result
-            
-            # Test negative values
-            result = color_profit_loss(-50)
-            assert "red" in result
-            assert "color: red" == result
-            
-            # Test zero values
-            result = color_profit_loss(0)
-            assert "black" in result
-            assert "color: black" == result
-            
-            # Test percentage strings
-            result = color_profit_loss("5.5%")
-            assert "green" in result
-            
-            result = color_profit_loss("-2.3%")
-            assert "red" in result
-            
-            # Test invalid values
-            result = color_profit_loss("invalid")
-            assert result == ""
-            
-        except ImportError as e:
-            pytest.fail(f"Failed to test color_profit_loss: {e}")
-
-
-class TestDashboardDataFlow:
-    """Test dashboard data flow and integration."""
-    
-    @patch('streamlit.cache_data')
-    def test_load_dashboard_data_structure(self, mock_cache):
-        """Test that dashboard data loading returns correct structure."""
-        try:
-            from ui.dashboard import load_dashboard_data
-            
-            # Mock all dependencies
-            with patch('ui.dashboard._get_portfolio_df') as mock_portfolio, \
-                 patch('ui.dashboard.load_option_trades') as mock_options, \
-                 patch('ui.dashboard.get_total_cash_by_platform') as mock_deposits, \
-                 patch('ui.dashboard.get_platform_cash_available_map') as mock_cash:
-                
-                # Setup mock data
-                mock_portfolio.return_value = pd.DataFrame({'test': ['data']})
-                mock_options.return_value = [{'id': 1, 'platform_id': 1}]
-                mock_deposits.return_value = {'Platform1': 1000.0}
-                mock_cash.return_value = {'Platform1': 500.0}
-                
-                # Test the function
-                batch_data, portfolio_df, open_opts, deposits, cash_map = load_dashboard_data()
-                
-                # Verify structure
-                assert isinstance(batch_data, dict)
-                assert 'portfolio_df' in batch_data
-                assert 'open_opts' in batch_data
-                assert 'deposits_by_platform' in batch_data
-                assert 'platform_cash_map' in batch_data
-                
-                assert isinstance(portfolio_df, pd.DataFrame)
-                assert isinstance(open_opts, list)
-                assert isinstance(deposits, dict)
-                assert isinstance(cash_map, dict)
-                
-        except ImportError as e:
-            pytest.fail(f"Failed to test load_dashboard_data: {e}")
-    
-    @patch('streamlit.cache_data')
-    def test_dashboard_function_exists(self, mock_cache):
-        """Test that the main dashboard function exists and can be called without errors."""
-        try:
-            from ui.dashboard import dashboard
-            
-            # Mock streamlit functions to avoid rendering during tests
-            with patch('streamlit.header'), \
-                 patch('streamlit.subheader'), \
-                 patch('streamlit.spinner'), \
-                 patch('streamlit.dataframe'), \
-                 patch('streamlit.markdown'), \
-                 patch('streamlit.write'), \
-                 patch('streamlit.columns'), \
-                 patch('streamlit.altair_chart'):
-                
-                # Mock all the data loading functions
-                with patch('ui.dashboard.load_dashboard_data') as mock_load:
-                    mock_load.return_value = (
-                        {},  # batch_data
-                        pd.DataFrame(),  # portfolio_df
-                        [],  # open_opts
-                        {},  # deposits_by_platform
-                        {}   # platform_cash_map
-                    )
-                    
-                    # Mock all other functions called by dashboard
-                    with patch.multiple('ui.dashboard',
-                                       compute_asset_allocation=lambda: pd.DataFrame(),
-                                       get_positions_summary=lambda: pd.DataFrame(),
-                                       get_dashboard_position_summary_with_total=lambda: pd.DataFrame(),
-                                       get_option_trades_summary=lambda: pd.DataFrame(),
-                                       tax_summary=lambda: pd.DataFrame()):
-                        
-                        # This should not raise an exception
-                        try:
-                            dashboard()
-                        except Exception as e:
-                            pytest.fail(f"dashboard() function raised an exception: {e}")
-                            
-        except ImportError as e:
-            pytest.fail(f"Failed to import dashboard function: {e}")
\ No newline at end of file
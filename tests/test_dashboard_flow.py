@@ -0,0 +1,69 @@
+"""Test dashboard data flow and page rendering."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+import sys
+
+dashboard_mod = pytest.importorskip("ui.dashboard")
+
+
+class TestDashboardDataFlow:
+    """Test dashboard data flow and integration."""
+    
+    @pytest.mark.slow
+    @pytest.mark.heavy
+    def test_load_dashboard_data_structure(self, sample_df):
+        """Test that dashboard data loading returns correct structure."""
+        # Imported at collection, before any patching, so the real cached
+        # function is under test
+        load_dashboard_data = dashboard_mod.load_dashboard_data
+        
+        # Mock all dependencies
+        with patch('ui.dashboard._get_portfolio_df') as mock_portfolio, \
+             patch('ui.dashboard.load_option_trades_summary') as mock_options, \
+             patch('ui.dashboard.get_total_cash_by_platform') as mock_deposits, \
+             patch('ui.dashboard.get_platform_cash_available_map') as mock_cash:
+            
+            # Setup mock data
+            mock_portfolio.return_value = sample_df
+            mock_options.return_value = [{'id': 1, 'platform_id': 1}]
+            mock_deposits.return_value = {'Platform1': 1000.0}
+            mock_cash.return_value = {'Platform1': 500.0}
+            
+            # Test the function
+            batch_data, portfolio_df, open_opts, deposits, cash_map = load_dashboard_data()
+            
+            # Verify structure
+            assert isinstance(batch_data, dict)
+            assert 'portfolio_df' in batch_data
+            assert 'open_opts' in batch_data
+            assert 'deposits_by_platform' in batch_data
+            assert 'platform_cash_map' in batch_data
+            
+            assert isinstance(portfolio_df, pd.DataFrame)
+            assert isinstance(open_opts, list)
+            assert isinstance(deposits, dict)
+            assert isinstance(cash_map, dict)
+    
+    @pytest.mark.slow
+    @pytest.mark.heavy
+    def test_dashboard_function_exists(self, streamlit_noop, monkeypatch):
+        """Test that the main dashboard function exists and can be called without errors."""
+        portfolio_df = pd.DataFrame()
+        monkeypatch.setattr(dashboard_mod, "load_dashboard_data", lambda: ({}, portfolio_df, [], {}, {}))
+        # _allocation_pivot has its own test with real inputs; here only
+        # check that the page asks for it once
+        mock_allocation = MagicMock(return_value=pd.DataFrame())
+        monkeypatch.setattr(dashboard_mod, "_allocation_pivot", mock_allocation)
+        for name in ("get_total_investment_for_cashflow", "get_total_portfolio_value_by_platform",
+                     "_cached_positions_summary",
+                     "get_dashboard_position_summary_with_total",
+                     "_cached_option_trades_summary", "_cached_tax_summary"):
+            monkeypatch.setattr(dashboard_mod, name, lambda *args: pd.DataFrame())
+        
+        dashboard_mod.dashboard()
+        mock_allocation.assert_called_once_with()
+        # streamlit_noop stands in for st.sidebar too, so the timings toggle is on
+        timings_df = streamlit_noop.dataframe.call_args.args[0]
+        assert set(timings_df["Section"]) == {"dashboard data", *dashboard_mod._SECTION_LOADERS}
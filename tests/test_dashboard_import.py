@@ -0,0 +1,188 @@
+"""Test dashboard module imports and helper functions."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+import sys
+
+dashboard_mod = pytest.importorskip("ui.dashboard")
+
+
+def option_aggregates(market_value=None, cost_basis=None):
+    """Frame shaped like compute_option_aggregates' result, 0 where a platform has no value."""
+    return pd.DataFrame({'Cost Basis': pd.Series(cost_basis or {}, dtype=float),
+                         'Market Value': pd.Series(market_value or {}, dtype=float)}).fillna(0.0)
+
+
+class TestDashboardModule:
+    """Test dashboard module imports and basic functions."""
+    
+    def test_dashboard_import(self):
+        """Test that dashboard module can be imported."""
+        assert dashboard_mod.dashboard is not None
+        assert dashboard_mod.load_dashboard_data is not None
+    
+    def test_classify_ticker(self, monkeypatch):
+        """Test single-ticker classification through the batch classifier."""
+        infos = {'SPY': {'quoteType': 'ETF'}, 'AAPL': {'quoteType': 'EQUITY'}}
+        def tickers(symbols):
+            if symbols not in infos:
+                raise Exception("Network error")
+            return MagicMock(tickers={symbols: MagicMock(info=infos[symbols])})
+        monkeypatch.setattr(sys.modules["yfinance"], "Tickers", tickers)
+        
+        _classify_ticker = dashboard_mod._classify_ticker
+        
+        # Test ETF classification
+        assert _classify_ticker('SPY') == "ETF"
+        
+        # Test Stock classification
+        assert _classify_ticker('AAPL') == "Stock"
+        
+        # Test fallback case (exception)
+        assert _classify_ticker('INVALID') == "Stock"
+    
+    def test_classify_tickers_batch(self, monkeypatch):
+        """Test batched classification, including per-ticker fallback to Stock."""
+        class FailingTicker:
+            @property
+            def info(self):
+                raise Exception("Network error")
+        
+        batch = MagicMock(tickers={
+            'SPY': MagicMock(info={'quoteType': 'ETF'}),
+            'AAPL': MagicMock(info={'quoteType': 'EQUITY'}),
+            'BAD': FailingTicker(),
+        })
+        monkeypatch.setattr(sys.modules["yfinance"], "Tickers", MagicMock(return_value=batch))
+        
+        result = dashboard_mod._classify_tickers.__wrapped__(('AAPL', 'BAD', 'SPY'))
+        assert result == {'AAPL': 'Stock', 'BAD': 'Stock', 'SPY': 'ETF'}
+        assert dashboard_mod._classify_tickers.__wrapped__(()) == {}
+    
+    def test_classify_tickers_uses_disk_cache(self, isolated_ticker_type_cache, monkeypatch):
+        """Test that persisted tickers skip yfinance and only successful lookups are persisted."""
+        isolated_ticker_type_cache.set_many({'FNDX': 'ETF'})
+        tickers = MagicMock(return_value=MagicMock(tickers={'AAPL': MagicMock(info={'quoteType': 'EQUITY'})}))
+        monkeypatch.setattr(sys.modules["yfinance"], "Tickers", tickers)
+        
+        result = dashboard_mod._classify_tickers.__wrapped__(('AAPL', 'NOPE', 'FNDX'))
+        assert result == {'AAPL': 'Stock', 'NOPE': 'Stock', 'FNDX': 'ETF'}
+        tickers.assert_called_once_with("AAPL NOPE")
+        assert isolated_ticker_type_cache.get_many(['AAPL', 'NOPE']) == {'AAPL': 'Stock'}
+    
+    def test_classify_tickers_known_etfs_skip_lookup(self, isolated_ticker_type_cache, monkeypatch):
+        """Test that well-known ETFs are classified without yfinance or the disk cache."""
+        tickers = MagicMock(side_effect=AssertionError("network lookup"))
+        monkeypatch.setattr(sys.modules["yfinance"], "Tickers", tickers)
+        
+        assert dashboard_mod._classify_tickers.__wrapped__(('SPY', 'qqq')) == {'SPY': 'ETF', 'qqq': 'ETF'}
+        assert isolated_ticker_type_cache.get_many(['SPY', 'qqq']) == {}
+    
+    def test_compute_asset_allocation(self, portfolio_df, monkeypatch):
+        """Test asset allocation on real inputs: one stock holding plus option exposure."""
+        monkeypatch.setattr(dashboard_mod, "_classify_tickers", lambda tickers: {t: "Stock" for t in tickers})
+        open_opts = [{'platform_id': 1}]
+        monkeypatch.setattr(dashboard_mod, "load_option_trades_summary", lambda status=None: open_opts)
+        monkeypatch.setattr(dashboard_mod, "compute_option_aggregates",
+                            lambda opts: option_aggregates({'Test Platform': 250.0}) if opts is open_opts else None)
+        # Cached with no arguments; drop any result from an earlier test
+        dashboard_mod._open_option_aggregates.clear()
+        
+        result = dashboard_mod.compute_asset_allocation(portfolio_df)
+        dashboard_mod._open_option_aggregates.clear()
+        
+        assert result.to_dict('records') == [
+            {'Platform': 'Test Platform', 'Asset Type': 'Stock', 'Amount': 1000.0},
+            {'Platform': 'Test Platform', 'Asset Type': 'Options', 'Amount': 250.0},
+        ]
+    
+    def test_allocation_pivot(self, monkeypatch):
+        """Test that the allocation is pivoted per platform with totals and percentages."""
+        alloc = pd.DataFrame({
+            'Platform': ['A', 'A', 'B'],
+            'Asset Type': ['Stock', 'Options', 'ETF'],
+            'Amount': [750.0, 250.0, 40.0],
+        })
+        holdings = pd.DataFrame()
+        monkeypatch.setattr(dashboard_mod, "load_dashboard_data", lambda: ({}, holdings, [], {}, {}))
+        monkeypatch.setattr(dashboard_mod, "compute_asset_allocation",
+                            lambda portfolio_df=None: alloc if portfolio_df is holdings else None)
+        # Cached with no arguments; drop any result from an earlier test
+        dashboard_mod._allocation_pivot.clear()
+        
+        result = dashboard_mod._allocation_pivot()
+        dashboard_mod._allocation_pivot.clear()
+        
+        assert list(result.columns) == ['Platform', 'Stock', 'ETF', 'Options', 'Total',
+                                        'Stock %', 'ETF %', 'Options %']
+        assert result.to_dict('records') == [
+            {'Platform': 'A', 'Stock': 750.0, 'ETF': 0.0, 'Options': 250.0, 'Total': 1000.0,
+             'Stock %': 75.0, 'ETF %': 0.0, 'Options %': 25.0},
+            {'Platform': 'B', 'Stock': 0.0, 'ETF': 40.0, 'Options': 0.0, 'Total': 40.0,
+             'Stock %': 0.0, 'ETF %': 100.0, 'Options %': 0.0},
+        ]
+    
+    def test_total_investment_for_cashflow(self, portfolio_df, monkeypatch):
+        """Test that equity cost and open-option cost basis add up per platform."""
+        monkeypatch.setattr(dashboard_mod, "_open_option_aggregates",
+                            lambda: option_aggregates(cost_basis={'Test Platform': -50.0, 'Other': 20.0}))
+        
+        result = dashboard_mod.get_total_investment_for_cashflow(portfolio_df)
+        
+        assert result.to_dict('records') == [
+            {'Platform': 'Other', 'Total Investment': 20.0},
+            {'Platform': 'Test Platform', 'Total Investment': 1050.0},
+        ]
+    
+    def test_total_portfolio_value_by_platform(self, monkeypatch):
+        """Test that equity and open-option values add up and non-positive platforms drop out."""
+        monkeypatch.setattr(dashboard_mod, "_open_option_aggregates",
+                            lambda: option_aggregates({'Test Platform': 25.5, 'Other': 10.0, 'Short': -5.0}))
+        holdings = pd.DataFrame({'platform': ['Test Platform', 'Test Platform'], 'current_value': [700.0, 250.0]})
+        
+        result = dashboard_mod.get_total_portfolio_value_by_platform(holdings)
+        
+        assert result.to_dict('records') == [
+            {'Platform': 'Other', 'Portfolio Value': 10.0},
+            {'Platform': 'Test Platform', 'Portfolio Value': 975.5},
+        ]
+    
+    def test_dashboard_position_summary(self, db_utils, monkeypatch):
+        """Test per-platform investment, value and gain from equities plus open options."""
+        platforms = db_utils.PlatformCache()
+        platforms.cache = {'Test Platform': 1, 'Idle': 2}
+        monkeypatch.setattr(dashboard_mod, "PLATFORM_CACHE", platforms)
+        monkeypatch.setattr(dashboard_mod, "_open_option_aggregates",
+                            lambda: option_aggregates({'Test Platform': 150.0}, cost_basis={'Test Platform': 100.0}))
+        holdings = pd.DataFrame({
+            'platform': ['Test Platform', 'Test Platform'],
+            'trade_cost': [600.0, 300.0],
+            'current_value': [700.0, 250.0],
+        })
+        
+        result = dashboard_mod.get_dashboard_position_summary(holdings)
+        
+        assert result.to_dict('records') == [{
+            'Platform': 'Test Platform', 'Total Investment': 1000.0, 'Total Portfolio Value': 1100.0,
+            'Total Unrealized Gains': 100.0, 'Pct Unrealized Gain': '10.0%',
+        }]
+    
+    def test_dashboard_position_summary_with_total(self, monkeypatch):
+        """Test that the total row sums the platform rows and recomputes the percentage."""
+        summary = pd.DataFrame({
+            'Platform': ['A', 'B'],
+            'Total Investment': [1000.0, 500.0],
+            'Total Portfolio Value': [1100.0, 450.0],
+            'Total Unrealized Gains': [100.0, -50.0],
+            'Pct Unrealized Gain': ['10.0%', '-10.0%'],
+        })
+        monkeypatch.setattr(dashboard_mod, "get_dashboard_position_summary", lambda portfolio_df=None: summary.copy())
+        
+        result = dashboard_mod.get_dashboard_position_summary_with_total(pd.DataFrame())
+        
+        assert result.to_dict('records')[-1] == {
+            'Platform': 'Total', 'Total Investment': 1500.0, 'Total Portfolio Value': 1550.0,
+            'Total Unrealized Gains': 50.0, 'Pct Unrealized Gain': '3.33%',
+        }
+        assert len(result) == 3
@@ -0,0 +1,37 @@
+"""Test that the UI page modules import and expose their entry points."""
+
+
+class TestUIComponents:
+    """Test individual UI component modules."""
+    
+    def test_positions_ui_import(self, ui_modules):
+        """Test that positions_ui can be imported."""
+        module = ui_modules['ui.positions_ui']
+        assert module.positions_ui is not None
+        assert module.get_positions_summary is not None
+    
+    def test_option_trades_ui_import(self, ui_modules):
+        """Test that option_trades_ui can be imported."""
+        module = ui_modules['ui.option_trades_ui']
+        assert module.option_trades_ui is not None
+        assert module.get_option_trades_summary is not None
+    
+    def test_portfolio_report_import(self, ui_modules):
+        """Test that portfolio_report can be imported."""
+        module = ui_modules['ui.portfolio_report']
+        assert module.portfolio_ui is not None
+        assert module.get_position_summary_with_total is not None
+    
+    def test_data_entry_import(self, ui_modules):
+        """Test that data_entry can be imported."""
+        assert ui_modules['ui.data_entry'].data_entry is not None
+    
+    def test_taxes_ui_import(self, ui_modules):
+        """Test that taxes_ui can be imported."""
+        module = ui_modules['ui.taxes_ui']
+        assert module.taxes_ui is not None
+        assert module.tax_summary is not None
+    
+    def test_cash_flows_ui_import(self, ui_modules):
+        """Test that cash_flows_ui can be imported."""
+        assert ui_modules['ui.cash_flows_ui'].cash_flows_ui is not None
@@ -3,200 +3,316 @@
 import pytest
 from unittest.mock import patch, MagicMock
 import pandas as pd
+from decimal import Decimal
+from pandas.io.formats.style import Styler
 import sys
 
+utils_mod = pytest.importorskip("ui.utils")
+positions_mod = pytest.importorskip("ui.positions_ui")
+portfolio_mod = pytest.importorskip("ui.portfolio_report")
+error_handling_mod = pytest.importorskip("ui.error_handling")
+strategies_mod = pytest.importorskip("ui.option_strategies")
+csv_upload_mod = pytest.importorskip("ui.csv_upload")
+cash_flows_mod = pytest.importorskip("ui.cash_flows_ui")
+option_trades_mod = pytest.importorskip("ui.option_trades_ui")
+
+EXPECTED_CONFIG_ATTRS = frozenset({
+    'CACHE_TTL', 'PAGE_SIZE', 'DEFAULT_CHART_HEIGHT', 'OPTION_CONTRACT_SIZE'
+})
+
 
 class TestUIUtilities:
     """Test UI utility functions."""
     
     def test_utils_import(self):
         """Test that utils module can be imported."""
-        try:
-            from ui.utils import color_profit_loss, get_platform_id_to_name_map
-            assert color_profit_loss is not None
-            assert get_platform_id_to_name_map is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import utils: {e}")
+        assert utils_mod.color_profit_loss is not None
+        assert utils_mod.get_platform_id_to_name_map is not None
     
-    def test_color_profit_loss_function(self):
+    @pytest.mark.parametrize("value,expected", [
+        (100, "color: green"),
+        (100.5, "color: green"),
+        (-50, "color: red"),
+        (-50.25, "color: red"),
+        (0, "color: black"),
+        ("5.5%", "color: green"),
+        ("-2.3%", "color: red"),
+        ("invalid", ""),
+        (None, ""),
+    ])
+    def test_color_profit_loss_function(self, value, expected):
         """Test color_profit_loss utility function."""
-        try:
-            from ui.utils import color_profit_loss
-            
-            # Test positive values
-            result = color_profit_loss(100.5)
-            assert "green" in result
-            assert "color: green" == result
-            
-            # Test negative values
-            result = color_profit_loss(-50.25)
-            assert "red" in result
-            assert "color: red" == result
-            
-            # Test zero values
-            result = color_profit_loss(0)
-            assert "black" in result
-            assert "color: black" == result
-            
-            # Test percentage strings
-            result = color_profit_loss("5.5%")
-            assert "green" in result
-            
-            result = color_profit_loss("-2.3%")
-            assert "red" in result
-            
-            # Test invalid values
-            result = color_profit_loss("invalid")
-            assert result == ""
-            
-            result = color_profit_loss(None)
-            assert result == ""
-            
-        except ImportError as e:
-            pytest.fail(f"Failed to test color_profit_loss: {e}")
-    
-    @patch('ui.utils.PLATFORM_CACHE')
-    def test_platform_id_mapping(self, mock_cache):
+        assert utils_mod.color_profit_loss(value) == expected
+
+    def test_color_profit_loss_column_matches_cellwise(self):
+        """The column styler gives the same colors as color_profit_loss per cell."""
+        col = pd.Series([100, -50.25, 0, "5.5%", "-2.3%", "invalid", None], dtype=object)
+        expected = [utils_mod.color_profit_loss(v) for v in col]
+        assert list(utils_mod.color_profit_loss_column(col)) == expected
+
+    def test_platform_id_mapping(self, db_utils, monkeypatch):
         """Test platform ID to name mapping function."""
-        mock_cache.cache = {'Platform1': 1, 'Platform2': 2}
+        cache = db_utils.PlatformCache()
+        cache.cache = {'Platform1': 1, 'Platform2': 2}
+        monkeypatch.setattr(utils_mod, "PLATFORM_CACHE", cache)
+        
+        result = utils_mod.get_platform_id_to_name_map()
+        expected = {1: 'Platform1', 2: 'Platform2'}
+        assert result == expected
         
-        try:
-            from ui.utils import get_platform_id_to_name_map
-            
-            result = get_platform_id_to_name_map()
-            expected = {1: 'Platform1', 2: 'Platform2'}
-            assert result == expected
-            
-        except ImportError as e:
-            pytest.fail(f"Failed to test get_platform_id_to_name_map: {e}")
+        # Replacing the cache rebuilds the reverse map
+        cache.cache = {'Platform3': 3}
+        assert utils_mod.get_platform_id_to_name_map() == {3: 'Platform3'}
     
-    def test_apply_profit_loss_styling(self):
+    def test_platform_categorical(self):
+        """IDs map to name categories in sorted order; unknown and missing IDs become NaN."""
+        ids = pd.Series([2, 1, 9, None, 2])
+        result = utils_mod.platform_categorical(ids, {1: 'Webull', 2: 'Robinhood'})
+        assert list(result.categories) == ['Robinhood', 'Webull']
+        assert list(result[[0, 1, 4]]) == ['Robinhood', 'Webull', 'Robinhood']
+        assert result.isna().tolist() == [False, False, True, True, False]
+
+    def test_apply_profit_loss_styling(self, profit_loss_df, empty_df):
         """Test apply_profit_loss_styling function."""
-        try:
-            from ui.utils import apply_profit_loss_styling
-            
-            # Create test dataframe
-            df = pd.DataFrame({
-                'profit_loss': [100, -50, 0],
-                'gain': [25, -10, 5],
-                'other': [1, 2, 3]
-            })
-            
-            # Test with columns list
-            cols = ['profit_loss', 'gain']
-            result = apply_profit_loss_styling(df, cols)
-            assert result is not None
-            
-            # Test with empty columns
-            result = apply_profit_loss_styling(df, [])
-            assert result is df  # Should return original df
-            
-            # Skip None columns test due to type annotation issues
-            # The function signature expects List[str], not None
-            
-        except ImportError as e:
-            pytest.fail(f"Failed to test apply_profit_loss_styling: {e}")
-
-
-class TestUIComponents:
-    """Test individual UI component modules."""
-    
-    def test_positions_ui_import(self):
-        """Test that positions_ui can be imported."""
-        try:
-            from ui.positions_ui import positions_ui, get_positions_summary
-            assert positions_ui is not None
-            assert get_positions_summary is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import positions_ui: {e}")
-    
-    def test_option_trades_ui_import(self):
-        """Test that option_trades_ui can be imported."""
-        try:
-            from ui.option_trades_ui import option_trades_ui, get_option_trades_summary
-            assert option_trades_ui is not None
-            assert get_option_trades_summary is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import option_trades_ui: {e}")
-    
-    def test_portfolio_report_import(self):
-        """Test that portfolio_report can be imported."""
-        try:
-            from ui.portfolio_report import portfolio_ui, get_position_summary_with_total
-            assert portfolio_ui is not None
-            assert get_position_summary_with_total is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import portfolio_report: {e}")
-    
-    def test_data_entry_import(self):
-        """Test that data_entry can be imported."""
-        try:
-            from ui.data_entry import data_entry
-            assert data_entry is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import data_entry: {e}")
-    
-    def test_taxes_ui_import(self):
-        """Test that taxes_ui can be imported."""
-        try:
-            from ui.taxes_ui import taxes_ui, tax_summary
-            assert taxes_ui is not None
-            assert tax_summary is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import taxes_ui: {e}")
-    
-    def test_cash_flows_ui_import(self):
-        """Test that cash_flows_ui can be imported."""
-        try:
-            from ui.cash_flows_ui import cash_flows_ui
-            assert cash_flows_ui is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import cash_flows_ui: {e}")
+        apply_profit_loss_styling = utils_mod.apply_profit_loss_styling
+        
+        # Test with columns list
+        result = apply_profit_loss_styling(profit_loss_df, ['profit_loss'])
+        assert isinstance(result, Styler)
+        
+        # Test with empty columns
+        assert apply_profit_loss_styling(empty_df, []) is empty_df  # Should return original df
+        
+        # Skip None columns test due to type annotation issues
+        # The function signature expects List[str], not None
+
+    def test_option_type_from_strategy(self):
+        """Strategies naming a call map to 'call'; everything else, missing included, to 'put'."""
+        strategy = pd.Series(['Long Call', 'Cash Secured Put', 'COVERED CALL', None], index=[5, 6, 7, 8])
+        result = utils_mod.option_type_from_strategy(strategy)
+        assert result.tolist() == ['call', 'put', 'call', 'put']
+        assert list(result.index) == [5, 6, 7, 8]
+
+    def test_platform_option_exposure_signs(self, monkeypatch):
+        """Debits add exposure, credits subtract it, unpriced options count as zero."""
+        prices = pd.DataFrame({
+            'strike': [100.0, 110.0, 120.0],
+            'expiry': ['2025-01-17'] * 3,
+            'type': ['call', 'put', 'call'],
+            'current_price': [1.5, 0.5, None],
+        })
+        monkeypatch.setattr(utils_mod, "get_batch_option_prices", lambda ticker, opts: prices)
+        options = [
+            {'Platform': 'A', 'ticker': 'XYZ', 'strategy': 'Long Call', 'strike_price': 100,
+             'expiry_date': '2025-01-17', 'transaction_type': 'Debit'},
+            {'Platform': 'A', 'ticker': 'XYZ', 'strategy': 'Short Put', 'strike_price': 110,
+             'expiry_date': '2025-01-17', 'transaction_type': 'credit'},
+            {'Platform': 'B', 'ticker': 'XYZ', 'strategy': 'Long Call', 'strike_price': 120,
+             'expiry_date': '2025-01-17', 'transaction_type': 'debit'},
+        ]
+
+        assert utils_mod.get_platform_option_exposure(options) == {'A': 100.0, 'B': 0.0}
+
+    def test_options_cost_basis_signs(self, monkeypatch):
+        """Debit premiums count as paid, credit premiums as received, per platform."""
+        monkeypatch.setattr(utils_mod, "get_platform_id_to_name_map", lambda: {1: 'A', 2: 'B'})
+        options = [
+            {'platform_id': 1, 'option_open_price': Decimal('1.25'), 'transaction_type': 'Debit'},
+            {'platform_id': 1, 'option_open_price': 0.5, 'transaction_type': 'credit'},
+            {'platform_id': 2, 'option_open_price': None, 'transaction_type': 'debit'},
+        ]
+
+        assert utils_mod.get_options_cost_basis(options) == {'A': 75.0, 'B': 0.0}
+
+
+    def test_option_aggregates_fetch_prices_once_per_ticker(self, monkeypatch):
+        """Cost basis and market value come from one pass with one price fetch per ticker."""
+        monkeypatch.setattr(utils_mod, "get_platform_id_to_name_map", lambda: {1: 'A', 2: 'B'})
+        fetches = []
+        def batch_prices(ticker, opts):
+            fetches.append(ticker)
+            return pd.DataFrame([{**o, 'current_price': {'XYZ': 2.0, 'ABC': None}[ticker]} for o in opts])
+        monkeypatch.setattr(utils_mod, "get_batch_option_prices", batch_prices)
+        options = [
+            {'platform_id': 1, 'ticker': 'XYZ', 'strategy': 'Long Call', 'strike_price': Decimal('100'),
+             'expiry_date': '2025-01-17', 'option_open_price': Decimal('1.5'), 'transaction_type': 'Debit'},
+            {'platform_id': 1, 'ticker': 'XYZ', 'strategy': 'Short Put', 'strike_price': 90,
+             'expiry_date': '2025-01-17', 'option_open_price': 0.5, 'transaction_type': 'credit'},
+            {'platform_id': 2, 'ticker': 'ABC', 'strategy': 'Long Put', 'strike_price': 10,
+             'expiry_date': '2025-02-21', 'option_open_price': 1.0, 'transaction_type': 'debit'},
+        ]
+
+        result = utils_mod.compute_option_aggregates(options)
+        assert sorted(fetches) == ['ABC', 'XYZ']
+        assert result.to_dict('index') == {
+            'A': {'Cost Basis': 100.0, 'Market Value': 0.0},
+            'B': {'Cost Basis': 100.0, 'Market Value': 0.0},
+        }
+
+        # Prices the caller already has are used as given, without fetching
+        fetches.clear()
+        result = utils_mod.compute_option_aggregates(options, current_prices=[3.0, None, 2.0])
+        assert fetches == []
+        assert result['Market Value'].to_dict() == {'A': 300.0, 'B': 200.0}
+
+    def test_unrealized_pnl_single_leg_prices(self, monkeypatch):
+        """Single-leg trades are priced per ticker batch; unpriced trades get no P&L."""
+        def batch_prices(ticker, opts):
+            return pd.DataFrame([{**o, 'current_price': 3.0 if o['strike'] == 100.0 else None} for o in opts])
+        monkeypatch.setattr(utils_mod, "get_batch_option_prices", batch_prices)
+        df = pd.DataFrame([
+            {'id': 1, 'ticker': 'XYZ', 'strategy': 'Long Call', 'strike_price': Decimal('100'),
+             'expiry_date': '2025-01-17', 'option_open_price': 2.0, 'transaction_type': 'debit', 'quantity': 2},
+            {'id': 2, 'ticker': 'XYZ', 'strategy': 'Short Put', 'strike_price': 90,
+             'expiry_date': '2025-01-17', 'option_open_price': 1.0, 'transaction_type': 'credit', 'quantity': 1},
+        ])
 
+        result = option_trades_mod.calculate_unrealized_pnl(df)
+        assert result['current_price'].tolist() == [3.0, None]
+        assert result['unrealized_pnl'].tolist()[0] == 200.0
+        assert pd.isna(result['unrealized_pnl'].tolist()[1])
+        assert 'option_type' not in result.columns
+
+    def test_option_chain_refresh_clears_only_chain_caches(self, monkeypatch):
+        """Test that clearing 'option_chains' reaches the chain and price caches and nothing else."""
+        db_utils = sys.modules["db.db_utils"]
+        chain_funcs = (utils_mod.get_option_chain_for_ticker, utils_mod.get_option_chain, utils_mod.get_option_price)
+        for func in chain_funcs:
+            monkeypatch.setattr(func, "clear", MagicMock())
+        positions_loader = MagicMock()
+        monkeypatch.setitem(db_utils._CACHE_REGISTRY, "positions", [positions_loader])
+
+        db_utils.clear_cache_selective(['option_chains'])
+        assert all(func.clear.call_count == 1 for func in chain_funcs)
+        positions_loader.clear.assert_not_called()
 
 class TestUIComponentFunctions:
     """Test specific UI component functions."""
     
-    @patch('streamlit.dataframe')
-    @patch('streamlit.write')
-    @patch('streamlit.markdown')
-    def test_positions_ui_function(self, mock_markdown, mock_write, mock_dataframe):
+    @pytest.mark.slow
+    @pytest.mark.heavy
+    def test_positions_ui_function(self, streamlit_noop, monkeypatch):
         """Test positions_ui function can be called without errors."""
-        try:
-            from ui.positions_ui import positions_ui
-            
-            with patch('streamlit.header'), \
-                 patch('streamlit.subheader'), \
-                 patch('ui.positions_ui.get_positions_summary', return_value=pd.DataFrame()):
-                
-                # This should not raise an exception
-                try:
-                    positions_ui()
-                except Exception as e:
-                    pytest.fail(f"positions_ui() raised an exception: {e}")
-                    
-        except ImportError as e:
-            pytest.fail(f"Failed to test positions_ui function: {e}")
+        import streamlit as st
+        
+        monkeypatch.setattr(st, "button", lambda *a, **k: False)
+        for name in ("load_positions", "load_closed_positions"):
+            monkeypatch.setattr(positions_mod, name, lambda: pd.DataFrame())
+        
+        positions_mod.positions_ui()
     
-    @patch('streamlit.dataframe')
-    @patch('streamlit.write')
-    def test_portfolio_ui_function(self, mock_write, mock_dataframe):
+    @pytest.mark.slow
+    @pytest.mark.heavy
+    def test_portfolio_ui_function(self, streamlit_noop, monkeypatch):
         """Test portfolio_ui function can be called without errors."""
-        try:
-            from ui.portfolio_report import portfolio_ui
-            
-            with patch('streamlit.header'), \
-                 patch('streamlit.subheader'), \
-                 patch('ui.portfolio_report.get_position_summary_with_total', return_value=pd.DataFrame()):
-                
-                # This should not raise an exception
-                try:
-                    portfolio_ui()
-                except Exception as e:
-                    pytest.fail(f"portfolio_ui() raised an exception: {e}")
-                    
-        except ImportError as e:
-            pytest.fail(f"Failed to test portfolio_ui function: {e}")
+        for name in ("get_position_summary_with_total", "_get_portfolio_df"):
+            monkeypatch.setattr(portfolio_mod, name, lambda: pd.DataFrame())
+        
+        portfolio_mod.portfolio_ui()
+
+    
+    def test_position_summary_per_platform(self, db_utils, monkeypatch):
+        """Test equity totals per platform, skipping platforms with no holdings."""
+        platforms = db_utils.PlatformCache()
+        platforms.cache = {'A': 1, 'Idle': 2}
+        monkeypatch.setattr(portfolio_mod, "PLATFORM_CACHE", platforms)
+        monkeypatch.setattr(portfolio_mod, "_get_portfolio_df", lambda: pd.DataFrame({
+            'platform': ['A', 'A'],
+            'trade_cost': [600.0, 400.0],
+            'current_value': [700.0, 450.0],
+            'unrealized_gain': [100.0, 50.0],
+        }))
+        
+        assert portfolio_mod.get_position_summary().to_dict('records') == [{
+            'Platform': 'A', 'Total Investment': 1000.0, 'Total Portfolio Value': 1150.0,
+            'Total Unrealized Gains': 150.0, 'Pct Unrealized Gain': '15.0%',
+        }]
+
+class TestCsvUpload:
+    """Test CSV parsing for trade uploads."""
+    
+    MAPPING = {"Symbol": "ticker", "Avg Price": "price", "Filled Time": "date", "Side": "trade_type"}
+    
+    def test_parse_maps_columns_and_drops_incomplete_rows(self, monkeypatch):
+        """Test that mapped columns are renamed, kept as strings, and rows without ticker/date dropped."""
+        monkeypatch.setattr(csv_upload_mod, "PLATFORM_CACHE", MagicMock(get=lambda name: 7))
+        data = (
+            b'Symbol,Name,Avg Price,Filled Time,Side\n'
+            b'AAPL,"Apple, Inc",001.50,2024-01-01,Buy\n'
+            b',Missing,1,2024-01-02,Sell\n'
+            b'MSFT,,2,,Sell\n'
+        )
+        table = csv_upload_mod._read_trade_table(data, self.MAPPING)
+        rows = csv_upload_mod._trade_rows(table, "WEBULL")
+        assert rows == [{
+            "ticker": "AAPL", "price": "001.50", "date": "2024-01-01",
+            "trade_type": "Buy", "platform_id": 7,
+        }]
+    
+    def test_parse_duplicate_header_uses_last_mapped_column(self):
+        """Test that when two CSV columns map to one DB column, the later one wins."""
+        table = csv_upload_mod._read_trade_table(
+            b'Symbol,Avg Price,Filled Time,Avg Price\nAAPL,1,2024-01-01,2\n', self.MAPPING)
+        assert table.to_pylist() == [{"ticker": "AAPL", "price": "2", "date": "2024-01-01"}]
+    
+    def test_parse_without_required_columns_returns_nothing(self):
+        """Test that a file missing the ticker or date column yields no table."""
+        assert csv_upload_mod._read_trade_table(b"Side\nBuy\n", self.MAPPING) is None
+    
+    def test_parse_keeps_rows_with_trailing_comma(self):
+        """Test that a trailing empty field on each data row doesn't drop the rows."""
+        table = csv_upload_mod._read_trade_table(
+            b'Symbol,Filled Time,Side\nAAPL,2024-01-02,Buy,\nMSFT,2024-01-03,Sell,\n', self.MAPPING)
+        assert table.to_pylist() == [
+            {"ticker": "AAPL", "date": "2024-01-02", "trade_type": "Buy"},
+            {"ticker": "MSFT", "date": "2024-01-03", "trade_type": "Sell"},
+        ]
+    
+    def test_parse_keeps_short_rows_in_file_order(self):
+        """Test that a row missing trailing fields is kept with None for them, in file order."""
+        table = csv_upload_mod._read_trade_table(
+            b'Symbol,Filled Time,Side\nAAPL,2024-01-02\nMSFT,2024-01-03,Sell\n', self.MAPPING)
+        assert table.to_pylist() == [
+            {"ticker": "AAPL", "date": "2024-01-02", "trade_type": None},
+            {"ticker": "MSFT", "date": "2024-01-03", "trade_type": "Sell"},
+        ]
+    
+    def test_parse_streams_batches_in_file_order(self):
+        """Test that a file spanning many record batches keeps every row, in order."""
+        body = "".join(f"T{i},1,2024-01-01,Buy\n" for i in range(60000)).encode()
+        table = csv_upload_mod._read_trade_table(b"Symbol,Avg Price,Filled Time,Side\n" + body, self.MAPPING)
+        assert table.num_rows == 60000
+        assert table["ticker"][0].as_py() == "T0" and table["ticker"][-1].as_py() == "T59999"
+
+
+class TestCashFlows:
+    """Test cash flow summaries."""
+
+    def test_cash_flow_summary_by_year_and_platform(self, monkeypatch):
+        """Deposits and withdrawals are totalled per (Year, Platform); other flow types are ignored."""
+        flows = [
+            {'platform_id': 1, 'flow_date': '2024-01-05', 'flow_type': 'deposit', 'amount': 100.0},
+            {'platform_id': 1, 'flow_date': '2024-03-01', 'flow_type': 'withdrawal', 'amount': 30.0},
+            {'platform_id': 2, 'flow_date': '2023-06-01', 'flow_type': 'deposit', 'amount': 5.0},
+            {'platform_id': 2, 'flow_date': '2024-06-01', 'flow_type': 'dividend', 'amount': 1.0},
+        ]
+        monkeypatch.setattr(cash_flows_mod, "load_cash_flows", lambda: flows)
+        monkeypatch.setattr(cash_flows_mod, "get_platform_id_to_name_map", lambda: {1: 'A', 2: 'B'})
+
+        summary = cash_flows_mod.get_cash_flow_summary()
+        assert summary.to_dict('records') == [
+            {'Year': 2023, 'Platform': 'B', 'Total Deposits': 5.0, 'Total Withdrawals': 0.0, 'Net Cash': 5.0},
+            {'Year': 2024, 'Platform': 'A', 'Total Deposits': 100.0, 'Total Withdrawals': 30.0, 'Net Cash': 70.0},
+        ]
+
+    def test_cash_flow_summary_uses_preloaded_frame(self, monkeypatch):
+        """A DataFrame passed in is summarized without reloading or being modified."""
+        monkeypatch.setattr(cash_flows_mod, "load_cash_flows", MagicMock(side_effect=AssertionError("reloaded")))
+        df = pd.DataFrame([{'Platform': 'A', 'flow_date': '2024-01-05', 'flow_type': 'deposit', 'amount': 10.0}])
+
+        summary = cash_flows_mod.get_cash_flow_summary(df)
+        assert summary["Net Cash"].tolist() == [10.0]
+        assert list(df.columns) == ['Platform', 'flow_date', 'flow_type', 'amount']
 
 
 class TestErrorHandling:
@@ -204,32 +320,24 @@ class TestErrorHandling:
     
     def test_error_handling_import(self):
         """Test that error_handling module can be imported."""
-        try:
-            from ui.error_handling import handle_api_error, yfinance_circuit_breaker, option_chain_circuit_breaker
-            assert handle_api_error is not None
-            assert yfinance_circuit_breaker is not None
-            assert option_chain_circuit_breaker is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import error_handling: {e}")
+        assert error_handling_mod.handle_api_error is not None
+        assert error_handling_mod.yfinance_circuit_breaker is not None
+        assert error_handling_mod.option_chain_circuit_breaker is not None
     
     def test_api_error_handler(self):
         """Test API error handling decorator."""
-        try:
-            from ui.error_handling import handle_api_error
-            
-            # Test decorator usage
-            @handle_api_error
-            def test_function():
-                raise Exception("Test error")
-            
-            with patch('streamlit.warning') as mock_warning:
-                # The decorator should catch the exception and call st.warning
-                result = test_function()
-                assert result is None  # Should return None on error
-                mock_warning.assert_called()
-                
-        except ImportError as e:
-            pytest.fail(f"Failed to test handle_api_error: {e}")
+        handle_api_error = error_handling_mod.handle_api_error
+        
+        # Test decorator usage
+        @handle_api_error
+        def test_function():
+            raise Exception("Test error")
+        
+        with patch('streamlit.warning') as mock_warning:
+            # The decorator should catch the exception and call st.warning
+            result = test_function()
+            assert result is None  # Should return None on error
+            mock_warning.assert_called()
 
 
 class TestDataFrameUtils:
@@ -237,31 +345,14 @@ class TestDataFrameUtils:
     
     def test_dataframe_utils_import(self):
         """Test that dataframe_utils module can be imported."""
-        try:
-            # Try to import the module, not a specific function
-            import ui.dataframe_utils
-            # If import succeeds, that's good enough for this test
-        except ImportError:
-            # If dataframe_utils doesn't exist or can't be imported, that's okay for this test
-            # We're just checking it doesn't break the import
-            pass
+        # Import the module, not a specific function; skip if it's absent
+        pytest.importorskip("ui.dataframe_utils")
     
-    def test_dataframe_operations(self):
+    def test_dataframe_operations(self, sample_df):
         """Test dataframe utility operations."""
-        try:
-            # Test basic dataframe creation
-            df = pd.DataFrame({
-                'column1': [1, 2, 3],
-                'column2': ['a', 'b', 'c'],
-                'column3': [1.5, 2.5, 3.5]
-            })
-            
-            assert isinstance(df, pd.DataFrame)
-            assert len(df) == 3
-            assert list(df.columns) == ['column1', 'column2', 'column3']
-            
-        except Exception as e:
-            pytest.fail(f"Failed to test dataframe operations: {e}")
+        assert isinstance(sample_df, pd.DataFrame)
+        assert len(sample_df) == 3
+        assert list(sample_df.columns) == ['column1', 'column2', 'column3']
 
 
 class TestConfig:
@@ -269,30 +360,20 @@ class TestConfig:
     
     def test_config_import(self):
         """Test that config can be imported."""
-        try:
-            from config import Config
-            assert Config is not None
-        except ImportError as e:
-            pytest.fail(f"Failed to import config: {e}")
+        from config import Config
+        assert Config is not None
     
     def test_config_values(self):
         """Test that config has expected values."""
-        try:
-            from config import Config
-            
-            # Test that important config values exist
-            assert hasattr(Config, 'CACHE_TTL')
-            assert hasattr(Config, 'PAGE_SIZE')
-            assert hasattr(Config, 'DEFAULT_CHART_HEIGHT')
-            assert hasattr(Config, 'OPTION_CONTRACT_SIZE')
-            
-            # Test some specific values
-            assert Config.OPTION_CONTRACT_SIZE == 100
-            assert isinstance(Config.CACHE_TTL, dict)
-            assert isinstance(Config.PAGE_SIZE, int)
-            
-        except ImportError as e:
-            pytest.fail(f"Failed to test config values: {e}")
+        from config import Config
+        
+        # Test that important config values exist
+        assert EXPECTED_CONFIG_ATTRS <= set(dir(Config))
+        
+        # Test some specific values
+        assert Config.OPTION_CONTRACT_SIZE == 100
+        assert isinstance(Config.CACHE_TTL, dict)
+        assert isinstance(Config.PAGE_SIZE, int)
 
 
 class TestOptionStrategies:
@@ -300,7 +381,7 @@ class TestOptionStrategies:
 
     def test_webull_option_levels(self):
         """Test that strategies are mapped to correct Webull levels."""
-        from ui.option_strategies import get_strategy_level
+        get_strategy_level = strategies_mod.get_strategy_level
 
         # Level 1
         assert get_strategy_level("covered call") == 1
@@ -330,7 +411,7 @@ class TestOptionStrategies:
 
     def test_is_multi_leg_decoupled(self):
         """Test that is_multi_leg is decoupled from levels and correctly checks leg count."""
-        from ui.option_strategies import is_multi_leg
+        is_multi_leg = strategies_mod.is_multi_leg
 
         # Multi-leg Level 2
         assert is_multi_leg("long straddle") is True
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from db.db_utils import (
@@ -8,34 +9,46 @@ from db.db_utils import (
     insert_cash_flow,
     get_total_cash_by_platform
 )
-from ui.utils import get_platform_id_to_name_map
+from ui.utils import get_platform_id_to_name_map, platform_categorical
 
 # ---------------------------------------------------------------------------
 # Summary helpers
 # ---------------------------------------------------------------------------
 
-def get_cash_flow_summary() -> pd.DataFrame:
-    """Returns a summary DataFrame of deposits and withdrawals per platform and year."""
-    cash_flows = load_cash_flows()
-    if not cash_flows:
-        return pd.DataFrame(columns=["Year", "Platform", "Total Deposits", "Total Withdrawals", "Net Cash"])
-
+def _cash_flows_df(cash_flows: List[Dict]) -> pd.DataFrame:
+    """Build the cash flows DataFrame with a Platform name column."""
     df = pd.DataFrame(cash_flows)
     platform_map = get_platform_id_to_name_map()
-    df["Platform"] = df["platform_id"].map(platform_map)
-    df["flow_date"] = pd.to_datetime(df["flow_date"])
-    df["Year"] = df["flow_date"].dt.year
+    df["Platform"] = platform_categorical(df["platform_id"], platform_map)
+    return df
 
-    deposits = df[df["flow_type"] == "deposit"].copy()
-    withdrawals = df[df["flow_type"] == "withdrawal"].copy()
 
-    dep_summary = deposits.groupby(["Year", "Platform"], as_index=False)["amount"].sum()
-    dep_summary = dep_summary.rename(columns={"amount": "Total Deposits"})
+def get_cash_flow_summary(df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Returns a summary DataFrame of deposits and withdrawals per platform and year.
 
-    with_summary = withdrawals.groupby(["Year", "Platform"], as_index=False)["amount"].sum()
-    with_summary = with_summary.rename(columns={"amount": "Total Withdrawals"})
+    Pass the cash flows DataFrame (with a Platform column) when the caller
+    already has it; otherwise the flows are loaded here.
+    """
+    if df is None:
+        cash_flows = load_cash_flows()
+        df = _cash_flows_df(cash_flows) if cash_flows else pd.DataFrame()
+    if df.empty:
+        return pd.DataFrame(columns=["Year", "Platform", "Total Deposits", "Total Withdrawals", "Net Cash"])
 
-    summary = pd.merge(dep_summary, with_summary, on=["Year", "Platform"], how="outer").fillna(0)
+    # Year straight from the datetime64 values: one cast, no .dt accessor
+    flow_dates = pd.to_datetime(df["flow_date"]).to_numpy()
+    df = df.assign(Year=flow_dates.astype("datetime64[Y]").astype(np.int64) + 1970)
+
+    # One pass over the flows: a deposit and a withdrawal column per (Year, Platform)
+    flows = df[df["flow_type"].isin(["deposit", "withdrawal"])]
+    summary = (
+        flows.pivot_table(index=["Year", "Platform"], columns="flow_type", values="amount",
+                          aggfunc="sum", fill_value=0, observed=True)
+        .reindex(columns=["deposit", "withdrawal"], fill_value=0)
+        .rename(columns={"deposit": "Total Deposits", "withdrawal": "Total Withdrawals"})
+        .rename_axis(columns=None)
+        .reset_index()
+    )
     summary["Net Cash"] = summary["Total Deposits"] - summary["Total Withdrawals"]
 
     return summary
@@ -647,10 +660,7 @@ def cash_flows_ui() -> None:
         st.info("No cash flows recorded.")
         return
 
-    df = pd.DataFrame(cash_flows)
-    platform_map = get_platform_id_to_name_map()
-    df["Platform"] = df["platform_id"].map(platform_map)
-    df = df.drop(columns=["platform_id"], errors='ignore')
+    df = _cash_flows_df(cash_flows)
 
     st.subheader("💵 All Cash Flows")
     display_df = df[["flow_date", "Platform", "flow_type", "amount", "notes"]].copy()
@@ -658,7 +668,7 @@ def cash_flows_ui() -> None:
     st.dataframe(display_df, use_container_width=True, hide_index=True)
 
     st.subheader("💵 Summary by Year and Platform")
-    summary_df = get_cash_flow_summary()
+    summary_df = get_cash_flow_summary(df)
     if not summary_df.empty:
         st.dataframe(summary_df, use_container_width=True, hide_index=True)
 
@@ -1,10 +1,98 @@
 import streamlit as st
 import csv
+import functools
 import json
 import io
-from db.db_utils import PLATFORM_CACHE, set_last_upload_time
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+from db.db_utils import PLATFORM_CACHE, set_last_upload_time, get_st_connection, clear_cache_selective
 from sqlalchemy import text
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
+
+# Rows per INSERT executemany; bounds the Python dicts alive at once
+_INSERT_CHUNK_ROWS = 5000
+
+@functools.lru_cache(maxsize=None)
+def _insert_trades_sql(columns: Tuple[str, ...]):
+    """Build (once per column set) the INSERT used by upload_csv."""
+    placeholders = ", ".join([f":{col}" for col in columns])
+    return text(f"INSERT INTO trades ({', '.join(columns)}) VALUES ({placeholders})")
+
+def _valid_trade_rows(batch: Union[pa.Table, pa.RecordBatch]) -> pa.Array:
+    """Mask of the rows that have both a ticker and a date."""
+    return pc.and_(
+        pc.and_(pc.is_valid(batch["ticker"]), pc.not_equal(batch["ticker"], "")),
+        pc.and_(pc.is_valid(batch["date"]), pc.not_equal(batch["date"], "")),
+    )
+
+def _read_trade_table_rows(data: bytes, positions: Dict[str, int]) -> pa.Table:
+    """Row-by-row fallback for files with ragged rows, read the way csv.DictReader did.
+
+    Fields past a row's end are None, and extra trailing fields are ignored.
+    """
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))[1:]
+    columns = {
+        target: [row[i] if i < len(row) else None for row in rows if row]
+        for target, i in positions.items()
+    }
+    table = pa.table(columns, schema=pa.schema([(name, pa.string()) for name in positions]))
+    return table.filter(_valid_trade_rows(table))
+
+def _read_trade_table(data: bytes, column_mapping: Dict[str, str]) -> Optional[pa.Table]:
+    """Parse UTF-8 CSV bytes into a table keyed by DB column, dropping rows without a ticker or date.
+
+    Returns None when the file has no ticker or date column. The file is read
+    as a stream of record batches, each filtered as it arrives, so only the
+    kept rows are held, in Arrow's columnar form. Every column is read as a
+    string, as csv.DictReader would, and only the mapped columns are parsed.
+    If any row's field count doesn't match the header (e.g. a trailing comma
+    on every data row), the whole file is re-read with csv.reader instead.
+    """
+    header = next(csv.reader(io.StringIO(data.split(b"\n", 1)[0].decode("utf-8"))), [])
+    # Compile the mapping against the header once: DB column -> CSV column
+    # position. A later CSV column mapped to the same DB column wins
+    positions: Dict[str, int] = {}
+    for i, name in enumerate(header):
+        target = column_mapping.get(name)
+        if target:
+            positions[target] = i
+    if "ticker" not in positions or "date" not in positions:
+        return None
+    # Columns are read under positional names, so duplicate or blank
+    # headers can't make pyarrow pick the wrong column
+    sources = [f"c{i}" for i in positions.values()]
+    rejected = []
+    def _reject(row):
+        rejected.append(row)
+        return "skip"
+    reader = pv.open_csv(
+        pa.py_buffer(data),
+        read_options=pv.ReadOptions(column_names=[f"c{i}" for i in range(len(header))], skip_rows=1),
+        parse_options=pv.ParseOptions(invalid_row_handler=_reject),
+        convert_options=pv.ConvertOptions(
+            column_types={name: pa.string() for name in sources},
+            include_columns=sources,
+        ),
+    )
+    batches = []
+    for batch in reader:
+        batch = batch.select(sources).rename_columns(list(positions))
+        # Validate required fields
+        batches.append(batch.filter(_valid_trade_rows(batch)))
+    if rejected:
+        # Ragged rows keep their place in file order only in a row-by-row read
+        return _read_trade_table_rows(data, positions)
+    schema = pa.schema([(name, pa.string()) for name in positions])
+    return pa.Table.from_batches(batches, schema=schema)
+
+def _trade_rows(data: Union[pa.Table, pa.RecordBatch], platform_type: str) -> List[Dict[str, Any]]:
+    """Convert parsed trade rows to insert parameters, setting platform_id."""
+    rows = data.to_pylist()
+    platform_id = None if platform_type == "OTHER" else PLATFORM_CACHE.get(platform_type)
+    for row in rows:
+        row["platform_id"] = row.get("platform_id") if platform_type == "OTHER" else platform_id
+    return rows
 
 def upload_csv() -> None:
     """
@@ -14,12 +102,8 @@ def upload_csv() -> None:
     
     uploaded_file = st.file_uploader("Choose a file", type=["csv"])
     if uploaded_file:
-        # Read uploaded bytes directly without writing to a temp file
-        content = uploaded_file.read()
-        if isinstance(content, bytes):
-            s = content.decode("utf-8")
-        else:
-            s = str(content)
+        # Parse the uploaded bytes in place; no decode/encode round trip
+        data = uploaded_file.getvalue()
         try:
             with open("config/mapping_config.json", "r") as config_file:
                 mappings = json.load(config_file)
@@ -29,26 +113,23 @@ def upload_csv() -> None:
             return
         if st.button("Submit"):
             try:
-                conn = st.connection("postgresql", type="sql")
-                rows: List[Dict[str, Any]] = []
-                reader = csv.DictReader(io.StringIO(s))
-                for row in reader:
-                    mapped_row = {column_mapping[k]: v for k, v in row.items() if k in column_mapping and column_mapping[k]}
-                    # Validate required fields
-                    if not mapped_row.get("ticker") or not mapped_row.get("date"):
-                        continue
-                    mapped_row["platform_id"] = mapped_row.get("platform_id") if platform_type == "OTHER" else PLATFORM_CACHE.get(platform_type)
-                    rows.append(mapped_row)
-                if not rows:
+                conn = get_st_connection()
+                table = _read_trade_table(data, column_mapping)
+                if table is None or table.num_rows == 0:
                     st.warning("No valid rows found in the uploaded file.")
                     return
-                for row in reversed(rows):
-                    columns = list(row.keys())
-                    placeholders = ", ".join([f":{col}" for col in columns])
-                    sql = text(f"INSERT INTO trades ({', '.join(columns)}) VALUES ({placeholders})")
-                    with conn.session as session:
-                        session.execute(sql, row)
-                        session.commit()
+                sql = _insert_trades_sql(tuple(dict.fromkeys(table.column_names + ["platform_id"])))
+                # One transaction, one executemany per chunk; chunks and the
+                # rows within them go in reverse file order so ids still
+                # follow it for same-day trades
+                with conn.session as session:
+                    for batch in reversed(table.to_batches(max_chunksize=_INSERT_CHUNK_ROWS)):
+                        rows = _trade_rows(batch, platform_type)
+                        if rows:
+                            rows.reverse()
+                            session.execute(sql, rows)
+                    session.commit()
+                clear_cache_selective(['trades'])
                 st.success("Trades uploaded successfully!")
                 # Record the upload time (UTC)
                 try:
@@ -1,23 +1,48 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from ui.positions_ui import get_positions_summary
 from ui.portfolio_report import get_position_summary_with_total, _get_portfolio_df
 from ui.option_trades_ui import get_option_trades_summary
 from ui.taxes_ui import tax_summary
-import altair as alt
 import pandas as pd
-import yfinance as yf
-from db.db_utils import PLATFORM_CACHE, load_option_trades, get_total_cash_by_platform, get_platform_cash_available_map
-from ui.utils import get_platform_id_to_name_map, color_profit_loss, get_batch_option_prices, get_platform_option_exposure, get_options_cost_basis, get_options_portfolio_value
-from typing import Dict, Tuple, List
+from db.db_utils import PLATFORM_CACHE, load_option_trades_summary, get_total_cash_by_platform, get_platform_cash_available_map, register_cache
+from db.ticker_type_cache import TICKER_TYPE_CACHE
+from ui.utils import color_profit_loss_column, compute_option_aggregates
+from typing import Dict, Tuple, List, Optional
 
+logger = logging.getLogger(__name__)
+
+def _script_run_executor(max_workers: int) -> ThreadPoolExecutor:
+    """ThreadPoolExecutor whose workers carry this run's script context.
+
+    The context lets st.cache_data and the other Streamlit calls work in the
+    worker threads. Each DB helper opens its own session from the pooled
+    engine, so workers need no connection of their own.
+    """
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    )
+
+@register_cache('positions', 'options', 'cash')
 @st.cache_data(ttl=300, show_spinner=False)
 def load_dashboard_data() -> Tuple[Dict, pd.DataFrame, List[Dict], Dict[str, float], Dict[str, float]]:
     """Batch load all dashboard data to minimize database queries."""
-    # Load all data in parallel
-    portfolio_df = _get_portfolio_df()
-    open_opts = load_option_trades(status="open")
-    deposits_by_platform = get_total_cash_by_platform()
-    platform_cash_map = get_platform_cash_available_map()
+    # The four loads are independent, so run them concurrently
+    with _script_run_executor(max_workers=4) as executor:
+        portfolio_future = executor.submit(_get_portfolio_df)
+        open_opts_future = executor.submit(load_option_trades_summary, status="open")
+        deposits_future = executor.submit(get_total_cash_by_platform)
+        cash_map_future = executor.submit(get_platform_cash_available_map)
+        portfolio_df = portfolio_future.result()
+        open_opts = open_opts_future.result()
+        deposits_by_platform = deposits_future.result()
+        platform_cash_map = cash_map_future.result()
     
     return {
         'portfolio_df': portfolio_df,
@@ -26,156 +51,204 @@ def load_dashboard_data() -> Tuple[Dict, pd.DataFrame, List[Dict], Dict[str, flo
         'platform_cash_map': platform_cash_map
     }, portfolio_df, open_opts, deposits_by_platform, platform_cash_map
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def _classify_ticker(ticker: str) -> str:
-    """Return 'ETF' or 'Stock' using yfinance quoteType (cached)."""
+    """Return 'ETF' or 'Stock' for one ticker via the cached batch classifier."""
+    return _classify_tickers((ticker,))[ticker]
+
+def _quote_type_to_asset_type(info: Dict) -> str:
+    """Map a yfinance info dict to 'ETF' or 'Stock'."""
+    qtype = (info.get("quoteType") or "").upper()
+    return "ETF" if "ETF" in qtype else "Stock"
+
+# yf.Tickers shares one session but still fetches each .info separately, so
+# uncached tickers are looked up this many at a time
+_CLASSIFY_WORKERS = 8
+
+def _fetch_asset_type(batch: Dict, ticker: str) -> Optional[str]:
+    """Look up one ticker's asset type from a yf.Tickers batch; None if the lookup fails."""
     try:
-        info = yf.Ticker(ticker).info
-        qtype = (info.get("quoteType") or "").upper()
-        return "ETF" if "ETF" in qtype else "Stock"
+        return _quote_type_to_asset_type(batch[ticker.upper()].info)
+    except Exception as e:
+        logger.warning(f"Could not classify {ticker}: {e}")
+        return None
+
+# Widely held ETFs, classified without a cache or network lookup
+_KNOWN_ETFS = frozenset({
+    "SPY", "VOO", "IVV", "VTI", "QQQ", "QQQM", "DIA", "IWM", "IWF", "IWD",
+    "VUG", "VTV", "VB", "VO", "VEA", "VWO", "VXUS", "VT", "IEFA", "IEMG",
+    "EFA", "EEM", "SCHD", "SCHX", "SCHB", "SCHG", "SPLG", "RSP", "MDY", "IJH",
+    "IJR", "VIG", "VYM", "DGRO", "JEPI", "JEPQ", "XLK", "XLF", "XLE", "XLV",
+    "XLY", "XLP", "XLI", "XLU", "XLB", "XLRE", "XLC", "VGT", "SMH", "SOXX",
+    "ARKK", "BND", "AGG", "TLT", "IEF", "SHY", "BIL", "SGOV", "LQD", "HYG",
+    "TIP", "VNQ", "GLD", "IAU", "SLV", "USO", "UNG", "TQQQ", "SQQQ", "SPXL",
+    "SOXL", "UVXY", "VXX", "SH", "PSQ",
+})
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _classify_tickers(tickers: Tuple[str, ...]) -> Dict[str, str]:
+    """Return {ticker: 'ETF' | 'Stock'} for many tickers using one yf.Tickers batch (cached).
+
+    Tickers in _KNOWN_ETFS or the on-disk cache skip the network; the rest
+    share a single HTTP session and are fetched concurrently. Any lookup that
+    fails falls back to 'Stock' and is not persisted, so it is retried on a
+    later run.
+    """
+    types = {t: "ETF" for t in tickers if t.upper() in _KNOWN_ETFS}
+    types.update(TICKER_TYPE_CACHE.get_many([t for t in tickers if t not in types]))
+    missing = [t for t in tickers if t not in types]
+    if not missing:
+        return types
+    # Imported here so reruns served from the caches never load yfinance
+    import yfinance as yf
+    try:
+        batch = yf.Tickers(" ".join(missing)).tickers
     except Exception:
-        return "Stock"
+        return {**types, **{t: "Stock" for t in missing}}
+    with ThreadPoolExecutor(max_workers=min(_CLASSIFY_WORKERS, len(missing))) as executor:
+        results = dict(zip(missing, executor.map(lambda t: _fetch_asset_type(batch, t), missing)))
+    fetched = {t: asset_type for t, asset_type in results.items() if asset_type is not None}
+    TICKER_TYPE_CACHE.set_many(fetched)
+    types.update({t: fetched.get(t, "Stock") for t in missing})
+    return types
 
+# Per-platform cost basis and market value of the open option trades,
+# computed in one pass and shared by every dashboard summary that needs them
+@register_cache('options')
 @st.cache_data(ttl=300, show_spinner=False)
-def compute_asset_allocation() -> pd.DataFrame:
+def _open_option_aggregates() -> pd.DataFrame:
+    """compute_option_aggregates over the open option trades (cached)."""
+    return compute_option_aggregates(load_option_trades_summary(status="open"))
+
+# The summaries below take the portfolio frame the dashboard already loaded,
+# or load it themselves when given None. They are cheap pandas steps over
+# cached inputs, so they are left uncached and always match the frame passed in.
+# _allocation_pivot caches the table the page shows; it reads the frame from
+# load_dashboard_data itself so its cache key needs no DataFrame
+def compute_asset_allocation(portfolio_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Compute allocation per platform broken down into Stocks, ETFs, and Options.
     - Stocks/ETFs: sum of trade_cost from portfolio positions (entry_price * quantity)
     - Options: sum of abs(option_open_price * 100) for open option trades (assume 1 contract per record)
     """
-    portfolio_df = _get_portfolio_df()  # from ui/portfolio_report.py
-    rows = []
+    if portfolio_df is None:
+        portfolio_df = _get_portfolio_df()  # from ui/portfolio_report.py
+    frames = []
     if not portfolio_df.empty:
-        # Determine asset type per ticker
-        portfolio_df["Asset Type"] = portfolio_df["ticker"].apply(_classify_ticker)
-        grp = portfolio_df.groupby(["platform", "Asset Type"], as_index=False)["trade_cost"].sum()
-        for _, r in grp.iterrows():
-            rows.append({
-                "Platform": r["platform"],
-                "Asset Type": r["Asset Type"],
-                "Amount": float(r["trade_cost"] or 0.0)
-            })
+        # Determine asset type once per unique ticker, in one batch
+        asset_types = _classify_tickers(tuple(sorted(portfolio_df["ticker"].dropna().unique())))
+        # Category keys let the groupby work on integer codes instead of
+        # hashing each row's strings
+        equity = pd.DataFrame({
+            "Platform": portfolio_df["platform"].astype("category"),
+            "Asset Type": pd.Categorical(portfolio_df["ticker"].map(asset_types), categories=["Stock", "ETF"]),
+            "Amount": pd.to_numeric(portfolio_df["trade_cost"], errors="coerce").fillna(0.0),
+        })
+        frames.append(equity.groupby(["Platform", "Asset Type"], as_index=False, observed=True)["Amount"].sum())
     
     # Options: approximate exposure from open option trades
-    open_opts = load_option_trades(status="open")
-    if open_opts:
-        platform_map = get_platform_id_to_name_map()
-        opts_df = pd.DataFrame(open_opts)
-        if "platform_id" in opts_df.columns:
-            opts_df["Platform"] = opts_df["platform_id"].map(platform_map)
-            
-            # Add platform mapping for consolidated function
-            open_opts_with_platform = opts_df.to_dict('records')
-            platform_exposure = get_platform_option_exposure(open_opts_with_platform)
-            
-            # Add to rows
-            for platform, exposure in platform_exposure.items():
-                if exposure != 0:
-                    rows.append({
-                        "Platform": platform,
-                        "Asset Type": "Options",
-                        "Amount": float(exposure or 0.0)
-                    })
+    platform_exposure = _open_option_aggregates()["Market Value"]
+    platform_exposure = platform_exposure[platform_exposure.fillna(0) != 0]
+    if not platform_exposure.empty:
+        frames.append(pd.DataFrame({
+            "Platform": platform_exposure.index,
+            "Asset Type": "Options",
+            "Amount": platform_exposure.to_numpy(),
+        }))
     
-    if not rows:
+    if not frames:
         return pd.DataFrame(columns=["Platform", "Asset Type", "Amount"])
-    return pd.DataFrame(rows)
+    return pd.concat(frames, ignore_index=True)
 
+ALLOCATION_ASSET_TYPES = ["Stock", "ETF", "Options"]
+
+@register_cache('positions', 'options')
 @st.cache_data(ttl=300, show_spinner=False)
-def get_total_portfolio_value_by_platform() -> pd.DataFrame:
+def _allocation_pivot() -> pd.DataFrame:
+    """Asset allocation in the shape the dashboard shows it (cached).
+
+    One row per platform with columns Platform, Stock, ETF, Options, Total and
+    the Stock %, ETF %, Options % shares of Total, all rounded to 2 places;
+    empty when there is nothing to allocate. Built from load_dashboard_data's
+    portfolio frame, so it takes no argument that would need hashing.
+    """
+    pct_cols = [f"{col} %" for col in ALLOCATION_ASSET_TYPES]
+    alloc_df = compute_asset_allocation(load_dashboard_data()[1])
+    if alloc_df.empty:
+        return pd.DataFrame(columns=["Platform", *ALLOCATION_ASSET_TYPES, "Total", *pct_cols])
+    # (Platform, Asset Type) pairs are already unique, so a plain reshape will do
+    pivot = (alloc_df.set_index(["Platform", "Asset Type"])["Amount"]
+             .unstack(fill_value=0.0)
+             .reindex(columns=ALLOCATION_ASSET_TYPES, fill_value=0.0)
+             .rename_axis(columns=None)
+             .reset_index())
+    pivot["Total"] = pivot[ALLOCATION_ASSET_TYPES].sum(axis=1)
+    for col in ALLOCATION_ASSET_TYPES:
+        pivot[f"{col} %"] = pivot[col] / pivot["Total"] * 100
+    return pivot.round(2)
+
+def get_total_portfolio_value_by_platform(portfolio_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Calculate current portfolio value for all platforms (equities + options).
     Portfolio Value = equity current values + options current market values
     This represents the current market value of all positions.
     """
-    portfolio_df = _get_portfolio_df()
-    rows = []
+    if portfolio_df is None:
+        portfolio_df = _get_portfolio_df()
     
     # Get portfolio value from positions (stocks and ETFs - current market value)
-    equity_value_by_platform = {}
+    equity_value = pd.Series(dtype=float)
     if not portfolio_df.empty:
-        equity_val = portfolio_df.groupby("platform", as_index=False)["current_value"].sum()
-        for _, row in equity_val.iterrows():
-            equity_value_by_platform[row["platform"]] = float(row["current_value"] or 0.0)
+        equity_value = (pd.to_numeric(portfolio_df["current_value"], errors="coerce")
+                        .groupby(portfolio_df["platform"]).sum())
     
     # Get options portfolio value (current market value) for each platform
-    options_value_by_platform = {}
-    open_opts = load_option_trades(status="open")
-    if open_opts:
-        options_value_by_platform = get_options_portfolio_value(open_opts)
+    options_value = _open_option_aggregates()["Market Value"]
     
     # Combine equities and options for all platforms
-    all_platforms = set(equity_value_by_platform.keys()) | set(options_value_by_platform.keys())
-    for platform in all_platforms:
-        equity_val = equity_value_by_platform.get(platform, 0.0)
-        options_val = options_value_by_platform.get(platform, 0.0)
-        total_val = equity_val + options_val
-        if total_val > 0 or equity_val > 0:
-            rows.append({
-                "Platform": platform,
-                "Portfolio Value": round(total_val, 2)
-            })
-    
-    if not rows:
-        return pd.DataFrame(columns=["Platform", "Portfolio Value"])
-    
-    result_df = pd.DataFrame(rows)
-    return result_df.sort_values("Platform").reset_index(drop=True)
+    total_value = equity_value.add(options_value, fill_value=0.0)
+    equity_value = equity_value.reindex(total_value.index, fill_value=0.0)
+    total_value = total_value[(total_value > 0) | (equity_value > 0)].round(2)
+    return (pd.DataFrame({"Platform": total_value.index, "Portfolio Value": total_value.to_numpy()})
+            .sort_values("Platform").reset_index(drop=True))
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_dashboard_position_summary() -> pd.DataFrame:
+def get_dashboard_position_summary(portfolio_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Returns a summary DataFrame for each platform (investment, value, unrealized gain).
     Includes both equities and options. This is dashboard-specific; portfolio_report shows equities only."""
-    portfolio_df = _get_portfolio_df()
-    rows = []
-    for platform in PLATFORM_CACHE.keys():
-        # Get equity investment (cost basis) from stocks and ETFs
-        equity_group = portfolio_df[portfolio_df["platform"] == platform]
-        equity_investment = equity_group["trade_cost"].sum() if not equity_group.empty else 0.0
-        
-        # Get equity portfolio value (current market value)
-        equity_portfolio_value = equity_group["current_value"].sum() if not equity_group.empty else 0.0
-        
-        # Get options cost basis for this platform
-        open_opts = load_option_trades(status="open")
-        options_cost_basis = 0.0
-        options_portfolio_value = 0.0
-        if open_opts:
-            platform_map = get_platform_id_to_name_map()
-            platform_opts = [opt for opt in open_opts if platform_map.get(opt.get("platform_id")) == platform]
-            if platform_opts:
-                # Get cost basis (what you paid)
-                options_cb_dict = get_options_cost_basis(platform_opts)
-                options_cost_basis = abs(options_cb_dict.get(platform, 0.0))
-                
-                # Get portfolio value (current market value)
-                options_pv_dict = get_options_portfolio_value(platform_opts)
-                options_portfolio_value = options_pv_dict.get(platform, 0.0)
-        
-        # Total Investment = equities cost basis + options cost basis
-        total_investment = equity_investment + options_cost_basis
-        
-        # Total Portfolio Value = equity current value + options current value
-        total_portfolio_value = equity_portfolio_value + options_portfolio_value
-        
-        # Total Unrealized Gain = total portfolio value - total investment
-        total_unrealized_gain = total_portfolio_value - total_investment
-        
-        if not equity_group.empty or total_investment > 0:
-            percent_unrealized = (total_unrealized_gain / total_investment * 100) if total_investment else 0.0
-            rows.append({
-                "Platform": platform,
-                "Total Investment": round(total_investment, 2),
-                "Total Portfolio Value": round(total_portfolio_value, 2),
-                "Total Unrealized Gains": round(total_unrealized_gain, 2),
-                "Pct Unrealized Gain": f"{round(percent_unrealized, 2)}%"
-            })
-    return pd.DataFrame(rows)
+    if portfolio_df is None:
+        portfolio_df = _get_portfolio_df()
+    platforms = pd.Index(list(PLATFORM_CACHE.keys()))
+    # Equity cost basis and current market value for every platform in one pass
+    equity_totals = (portfolio_df.groupby("platform")[["trade_cost", "current_value"]].sum().astype(float)
+                     if not portfolio_df.empty else pd.DataFrame(columns=["trade_cost", "current_value"], dtype=float))
+    has_equity = platforms.isin(equity_totals.index)
+    equity_totals = equity_totals.reindex(platforms, fill_value=0.0)
+    
+    # Options cost basis (what you paid) and current market value
+    option_aggregates = _open_option_aggregates().reindex(platforms, fill_value=0.0)
+    options_cost_basis = option_aggregates["Cost Basis"].abs()
+    options_portfolio_value = option_aggregates["Market Value"]
+    
+    # Total Investment = equities cost basis + options cost basis
+    total_investment = equity_totals["trade_cost"] + options_cost_basis
+    # Total Portfolio Value = equity current value + options current value
+    total_portfolio_value = equity_totals["current_value"] + options_portfolio_value
+    # Total Unrealized Gain = total portfolio value - total investment
+    total_unrealized_gain = total_portfolio_value - total_investment
+    percent_unrealized = (total_unrealized_gain / total_investment * 100).where(total_investment != 0, 0.0)
+    
+    summary_df = pd.DataFrame({
+        "Total Investment": total_investment,
+        "Total Portfolio Value": total_portfolio_value,
+        "Total Unrealized Gains": total_unrealized_gain,
+        "Pct Unrealized Gain": percent_unrealized,
+    }).round(2)
+    summary_df["Pct Unrealized Gain"] = summary_df["Pct Unrealized Gain"].astype(str) + "%"
+    summary_df = summary_df.rename_axis("Platform").reset_index()
+    return summary_df[has_equity | (total_investment.to_numpy() > 0)].reset_index(drop=True)
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_dashboard_position_summary_with_total() -> pd.DataFrame:
+def get_dashboard_position_summary_with_total(portfolio_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Returns the dashboard position summary with an additional total row (includes equities + options)."""
-    summary_df = get_dashboard_position_summary()
+    summary_df = get_dashboard_position_summary(portfolio_df)
     if not summary_df.empty:
         total_investment = summary_df["Total Investment"].sum()
         total_value = summary_df["Total Portfolio Value"].sum()
@@ -188,85 +261,163 @@ def get_dashboard_position_summary_with_total() -> pd.DataFrame:
             "Total Unrealized Gains": round(total_unrealized, 2),
             "Pct Unrealized Gain": f"{round(percent_unrealized, 2)}%"
         }
-        summary_df = pd.concat([summary_df, pd.DataFrame([overall_row])], ignore_index=True)
+        # Summary frames have a RangeIndex, so this appends in place
+        summary_df.loc[len(summary_df)] = overall_row
     return summary_df
 
-@st.cache_data(ttl=300, show_spinner=False)
-def get_total_investment_for_cashflow() -> pd.DataFrame:
+def get_total_investment_for_cashflow(portfolio_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Calculate total investment for cash flow tracking (includes both equities and options).
     Total Investment = equities (trade_cost) + options cost basis (option_open_price * 100)
     This represents what you paid for all positions.
     """
-    portfolio_df = _get_portfolio_df()
-    rows = []
+    if portfolio_df is None:
+        portfolio_df = _get_portfolio_df()
     
     # Get investment from positions (stocks and ETFs - cost basis)
-    equity_investment_by_platform = {}
+    equity_investment = pd.Series(dtype=float)
     if not portfolio_df.empty:
-        equity_inv = portfolio_df.groupby("platform", as_index=False)["trade_cost"].sum()
-        for _, row in equity_inv.iterrows():
-            equity_investment_by_platform[row["platform"]] = float(row["trade_cost"] or 0.0)
+        equity_investment = (pd.to_numeric(portfolio_df["trade_cost"], errors="coerce")
+                             .groupby(portfolio_df["platform"]).sum())
     
     # Get options cost basis (what you paid) for each platform
-    options_cost_basis_by_platform = {}
-    open_opts = load_option_trades(status="open")
-    if open_opts:
-        options_cost_basis_by_platform = get_options_cost_basis(open_opts)
+    options_cost_basis = _open_option_aggregates()["Cost Basis"].abs()
     
     # Combine equities and options for all platforms
-    all_platforms = set(equity_investment_by_platform.keys()) | set(options_cost_basis_by_platform.keys())
-    for platform in all_platforms:
-        equity_inv = equity_investment_by_platform.get(platform, 0.0)
-        options_cb = abs(options_cost_basis_by_platform.get(platform, 0.0))
-        total_inv = equity_inv + options_cb
-        if total_inv > 0 or equity_inv > 0 or options_cb > 0:
-            rows.append({
-                "Platform": platform,
-                "Total Investment": round(total_inv, 2)
-            })
-    
-    if not rows:
-        return pd.DataFrame(columns=["Platform", "Total Investment"])
-    
-    result_df = pd.DataFrame(rows)
-    return result_df.sort_values("Platform").reset_index(drop=True)
+    total_investment = equity_investment.add(options_cost_basis, fill_value=0.0)
+    keep = ((total_investment > 0)
+            | (equity_investment.reindex(total_investment.index, fill_value=0.0) > 0)
+            | (options_cost_basis.reindex(total_investment.index, fill_value=0.0) > 0))
+    total_investment = total_investment[keep].round(2)
+    return (pd.DataFrame({"Platform": total_investment.index, "Total Investment": total_investment.to_numpy()})
+            .sort_values("Platform").reset_index(drop=True))
+
+# Cached views of the summaries other pages compute on demand; the dashboard
+# reruns on every widget click, so these avoid redoing their DB and pandas
+# work until a writer clears the matching cache type
+@register_cache('positions')
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_positions_summary() -> pd.DataFrame:
+    """Positions summary for the dashboard (cached)."""
+    return get_positions_summary()
+
+@register_cache('options')
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_option_trades_summary() -> pd.DataFrame:
+    """Option trades summary for the dashboard (cached)."""
+    return get_option_trades_summary()
+
+@register_cache('positions', 'options', 'trades')
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_tax_summary() -> pd.DataFrame:
+    """Tax summary for the dashboard (cached)."""
+    return tax_summary()
+
+# Dashboard sections whose data is fetched concurrently; each one waits on
+# Postgres, so the page loads in about the time of the slowest section.
+# Config.DB_POOL holds enough connections for all of them at once
+_SECTION_LOADERS = {
+    "investment": lambda portfolio_df: get_total_investment_for_cashflow(portfolio_df),
+    "portfolio_value": lambda portfolio_df: get_total_portfolio_value_by_platform(portfolio_df),
+    "allocation": lambda portfolio_df: _allocation_pivot(),
+    "positions": lambda portfolio_df: _cached_positions_summary(),
+    "portfolio": lambda portfolio_df: get_dashboard_position_summary_with_total(portfolio_df),
+    "options": lambda portfolio_df: _cached_option_trades_summary(),
+    "taxes": lambda portfolio_df: _cached_tax_summary(),
+}
+
+def _submit_section_loaders(executor: ThreadPoolExecutor, portfolio_df: pd.DataFrame,
+                            timings: Optional[Dict[str, float]] = None) -> Dict:
+    """Start every dashboard section loader on the executor; returns {name: future}.
+
+    If timings is given, each loader's wall time in seconds is stored there
+    under its name once it finishes.
+    """
+    def run(name, loader):
+        start = time.perf_counter()
+        try:
+            return loader(portfolio_df)
+        finally:
+            if timings is not None:
+                timings[name] = time.perf_counter() - start
+    return {name: executor.submit(run, name, loader) for name, loader in _SECTION_LOADERS.items()}
+
+def _render_load_timings(timings: Dict[str, float]) -> None:
+    """Show how long each dashboard load took this run, slowest first, in the sidebar.
+
+    A loader served from st.cache_data finishes in milliseconds, so the table
+    also shows which sections missed their cache.
+    """
+    timings_df = (pd.DataFrame({"Section": list(timings), "Seconds": list(timings.values())})
+                  .sort_values("Seconds", ascending=False).round(3))
+    st.sidebar.dataframe(timings_df, hide_index=True)
 
 def dashboard():
     st.header("📊 Dashboard")
+    show_timings = st.sidebar.checkbox("Show load timings")
+    timings: Dict[str, float] = {}
 
-    # Load all dashboard data in one batch
+    # Load all dashboard data in one batch; its portfolio frame is shared
+    # with every section below instead of each one reloading it
     with st.spinner("Loading dashboard data..."):
-        dashboard_batch_data, portfolio_df, open_opts, deposits_by_platform, platform_cash_map = load_dashboard_data()
-        
+        start = time.perf_counter()
+        dashboard_data = load_dashboard_data()
+        timings["dashboard data"] = time.perf_counter() - start
+
+    with _script_run_executor(max_workers=len(_SECTION_LOADERS)) as executor:
+        futures = _submit_section_loaders(executor, dashboard_data[1], timings)
+        _render_dashboard(futures, dashboard_data)
+    if show_timings:
+        _render_load_timings(timings)
+
+# Lowercased names of the P/L columns colored in any dashboard summary table
+HIGHLIGHT_NAMES = frozenset({
+    "profit_loss", "gain", "total p/l (closed)", "pct_unrealized_gain",
+    "total unrealized gains", "pct unrealized gain",
+    "total option p/l (closed)", "unrealized gains (open)",
+    "total gain/loss", "total estimated tax",
+})
+
+def _render_summary_section(title: str, df: pd.DataFrame, empty_message: str) -> None:
+    """Render one summary table, coloring its HIGHLIGHT_NAMES columns."""
+    st.subheader(title)
+    if df.empty:
+        st.info(empty_message)
+        return
+    highlight_cols = [col for col in df.columns if col.lower() in HIGHLIGHT_NAMES]
+    if highlight_cols:
+        st.dataframe(df.style.apply(color_profit_loss_column, subset=highlight_cols), width="stretch", hide_index=True)
+    else:
+        st.dataframe(df, width="stretch", hide_index=True)
+
+def _render_dashboard(futures: Dict, dashboard_data: Tuple) -> None:
+    """Render the dashboard sections, waiting on each section's future in turn."""
+    dashboard_batch_data, portfolio_df, open_opts, deposits_by_platform, platform_cash_map = dashboard_data
     st.subheader("💵 Summary by Platform")
 
     # Build list of all platforms from both sources, stable sort
     all_platforms = sorted(set(list(deposits_by_platform.keys()) + list(platform_cash_map.keys())))
     if all_platforms:
-        cash_summary_data = []
-        for platform in all_platforms:
-            deposits = round(deposits_by_platform.get(platform, 0.0), 2)
-            cash_available = round(platform_cash_map.get(platform, deposits), 2)  # fallback to deposits if missing
-            cash_summary_data.append({
-                "Platform": platform,
-                "Deposits & Withdrawals": deposits,
-                "Cash Available": cash_available
-            })
-
-        cash_summary_df = pd.DataFrame(cash_summary_data)
+        deposits = [deposits_by_platform.get(platform, 0.0) for platform in all_platforms]
+        cash_summary_df = pd.DataFrame({
+            "Platform": all_platforms,
+            "Deposits & Withdrawals": deposits,
+            # fallback to deposits if missing
+            "Cash Available": [platform_cash_map.get(platform, d) for platform, d in zip(all_platforms, deposits)],
+        })
 
         # Attach Total Investment and Portfolio Value like before
-        investment_df = get_total_investment_for_cashflow()
-        investment_map = dict(zip(investment_df["Platform"], investment_df["Total Investment"])) if not investment_df.empty else {}
-        cash_summary_df["Total Investment"] = cash_summary_df["Platform"].map(lambda p: investment_map.get(p, 0.0))
+        investment_df = futures["investment"].result()
+        investment_by_platform = investment_df.set_index("Platform")["Total Investment"].astype(float)
+        cash_summary_df["Total Investment"] = cash_summary_df["Platform"].map(investment_by_platform).fillna(0.0)
 
-        portfolio_value_df = get_total_portfolio_value_by_platform()
-        portfolio_value_map = dict(zip(portfolio_value_df["Platform"], portfolio_value_df["Portfolio Value"])) if not portfolio_value_df.empty else {}
-        cash_summary_df["Portfolio Value"] = cash_summary_df["Platform"].map(lambda p: portfolio_value_map.get(p, 0.0))
+        portfolio_value_df = futures["portfolio_value"].result()
+        value_by_platform = portfolio_value_df.set_index("Platform")["Portfolio Value"].astype(float)
+        cash_summary_df["Portfolio Value"] = cash_summary_df["Platform"].map(value_by_platform).fillna(0.0)
 
         # Total Account Value = Cash Available + Portfolio Value (true account value)
-        cash_summary_df["Total Account Value"] = (cash_summary_df["Cash Available"] + cash_summary_df["Portfolio Value"]).round(2)
+        cash_summary_df["Total Account Value"] = cash_summary_df["Cash Available"] + cash_summary_df["Portfolio Value"]
+        cash_summary_df = cash_summary_df.round(2)
 
         # Ensure Total Account Value is last column for display
         display_cols = ["Platform", "Deposits & Withdrawals", "Cash Available", "Total Investment", "Portfolio Value", "Total Account Value"]
@@ -277,133 +428,83 @@ def dashboard():
 
     # --- Asset Allocation by Platform ---
     with st.spinner("Computing asset allocation..."):
-        alloc_df = compute_asset_allocation()
-        if not alloc_df.empty:
+        pivot = futures["allocation"].result()
+        if not pivot.empty:
             st.subheader("📦 Asset Allocation by Platform")
-            # Display table with amounts and percentages
-            pivot = alloc_df.pivot_table(index="Platform", columns="Asset Type", values="Amount", aggfunc="sum", fill_value=0.0).reset_index()
-            # Ensure columns order
-            for col in ["Stock", "ETF", "Options"]:
-                if col not in pivot.columns:
-                    pivot[col] = 0.0
-            
-            # Calculate row totals and percentages
-            pivot["Total"] = pivot[["Stock", "ETF", "Options"]].sum(axis=1)
-            for col in ["Stock", "ETF", "Options"]:
-                pivot[f"{col} %"] = (pivot[col] / pivot["Total"] * 100).round(2)
-            
             # Organize columns for display
-            amount_cols = ["Platform", "Stock", "ETF", "Options", "Total"]
-            pct_cols = ["Platform", "Stock %", "ETF %", "Options %"]
+            amount_cols = ["Platform", *ALLOCATION_ASSET_TYPES, "Total"]
+            pct_cols = ["Platform", *(f"{col} %" for col in ALLOCATION_ASSET_TYPES)]
             
             # Display amounts table
             st.write("Asset Amounts by Platform ($)")
-            st.dataframe(pivot[amount_cols].round(2), width="stretch", hide_index=True)
+            st.dataframe(pivot[amount_cols], width="stretch", hide_index=True)
             
             # Display percentages table
             st.write("Asset Distribution Percentages (%)")
-            st.dataframe(pivot[pct_cols].round(2), width="stretch", hide_index=True)
+            st.dataframe(pivot[pct_cols], width="stretch", hide_index=True)
             
             st.write("") # Add some spacing
             
-            # Calculate percentages for each platform
-            platforms = pivot["Platform"].unique()
-            cols = st.columns(min(3, len(platforms)))  # Max 3 charts per row
+            import altair as alt  # only needed once there is something to chart
             
-            for idx, platform in enumerate(platforms):
-                platform_data = pivot[pivot["Platform"] == platform]
-                total = platform_data[["Stock", "ETF", "Options"]].sum(axis=1).iloc[0]
-                
-                if total > 0:  # Only show pie chart if there are assets
-                    pie_data = []
-                    for asset_type in ["Stock", "ETF", "Options"]:
-                        value = platform_data[asset_type].iloc[0]
-                        percentage = (value / total * 100) if total > 0 else 0
-                        if value != 0:  # Only include non-zero values
-                            pie_data.append({
-                                "Asset Type": asset_type,
-                                "Amount": value,
-                                "Percentage": percentage
-                            })
+            # Pie data for every platform at once: one row per non-zero
+            # (Platform, Asset Type) with its share of the platform total
+            totals = pivot.set_index("Platform")["Total"]
+            long = pivot.melt(id_vars="Platform", value_vars=ALLOCATION_ASSET_TYPES,
+                              var_name="Asset Type", value_name="Amount")
+            long = long[long["Amount"] != 0]
+            long["Percentage"] = long["Amount"] / long["Platform"].map(totals) * 100
+            # Only platforms with assets get a chart
+            pie_by_platform = {p: sub.drop(columns="Platform") for p, sub in long.groupby("Platform", sort=False)
+                               if totals.at[p] > 0}
+            
+            cols = st.columns(max(1, min(3, len(pie_by_platform))))  # Max 3 charts per row
+            
+            for idx, (platform, pie_df) in enumerate(pie_by_platform.items()):
+                with cols[idx % 3]:
+                    # Create the base pie chart
+                    pie_chart = alt.Chart(pie_df).mark_arc(innerRadius=50).encode(
+                        theta=alt.Theta(field="Amount", type="quantitative"),
+                        color=alt.Color(field="Asset Type", type="nominal"),
+                        tooltip=[
+                            alt.Tooltip("Asset Type:N"),
+                            alt.Tooltip("Amount:Q", format="$,.2f"),
+                            alt.Tooltip("Percentage:Q", format=".1f", title="Percentage (%)")
+                        ]
+                    ).properties(
+                        title=f"{platform}"
+                    )
                     
-                    pie_df = pd.DataFrame(pie_data)
-                    if not pie_df.empty:
-                        with cols[idx % 3]:
-                            # Create the base pie chart
-                            pie_chart = alt.Chart(pie_df).mark_arc(innerRadius=50).encode(
-                                theta=alt.Theta(field="Amount", type="quantitative"),
-                                color=alt.Color(field="Asset Type", type="nominal"),
-                                tooltip=[
-                                    alt.Tooltip("Asset Type:N"),
-                                    alt.Tooltip("Amount:Q", format="$,.2f"),
-                                    alt.Tooltip("Percentage:Q", format=".1f", title="Percentage (%)")
-                                ]
-                            ).properties(
-                                title=f"{platform}"
-                            )
-                            
-                            # Add percentage labels
-                            pie_labels = alt.Chart(pie_df).mark_text(radius=80, size=11).encode(
-                                theta=alt.Theta(field="Amount", type="quantitative", stack=True),
-                                text=alt.Text("Percentage:Q", format=".1f", title="Percentage (%)"),
-                                color=alt.value("white")
-                            )
-                            
-                            st.altair_chart(pie_chart + pie_labels)
+                    # Add percentage labels
+                    pie_labels = alt.Chart(pie_df).mark_text(radius=80, size=11).encode(
+                        theta=alt.Theta(field="Amount", type="quantitative", stack=True),
+                        text=alt.Text("Percentage:Q", format=".1f", title="Percentage (%)"),
+                        color=alt.value("white")
+                    )
+                    
+                    st.altair_chart(pie_chart + pie_labels)
         else:
             st.info("No portfolio or option data available to compute allocation.")
 
     with st.spinner("Loading positions summary..."):
-        st.subheader("📈 Positions Summary")
-        pos_mgr_df = get_positions_summary()
-        if not pos_mgr_df.empty:
-            highlight_cols = [col for col in pos_mgr_df.columns if col.lower() in ["profit_loss", "gain", "total p/l (closed)", "pct_unrealized_gain"]]
-            if highlight_cols:
-                styled_df = pos_mgr_df.style.map(color_profit_loss, subset=highlight_cols)
-                st.dataframe(styled_df, width="stretch", hide_index=True)
-            else:
-                st.dataframe(pos_mgr_df, width="stretch", hide_index=True)
-        else:
-            st.info("No positions found for summary.")
+        _render_summary_section(
+            "📈 Positions Summary", futures["positions"].result(),
+            "No positions found for summary.")
     st.markdown("---")
 
     with st.spinner("Loading portfolio summary..."):
-        st.subheader("💼 Portfolio Summary")
-        summary_df = get_dashboard_position_summary_with_total()
-        if not summary_df.empty:
-            highlight_cols = [col for col in summary_df.columns if col.lower() in ["total unrealized gains", "pct unrealized gain"]]
-            if highlight_cols:
-                styled_df = summary_df.style.map(color_profit_loss, subset=highlight_cols)
-                st.dataframe(styled_df, width="stretch", hide_index=True)
-            else:
-                st.dataframe(summary_df, width="stretch", hide_index=True)
-        else:
-            st.info("No positions found for summary.")
+        _render_summary_section(
+            "💼 Portfolio Summary", futures["portfolio"].result(),
+            "No positions found for summary.")
     st.markdown("---")
 
     with st.spinner("Loading option trades summary..."):
-        st.subheader("📝 Option Trades Summary")
-        opt_df = get_option_trades_summary()
-        if not opt_df.empty:
-            highlight_cols = [col for col in opt_df.columns if col.lower() in ["profit_loss", "gain", "total option p/l (closed)", "unrealized gains (open)"]]
-            if highlight_cols:
-                styled_df = opt_df.style.map(color_profit_loss, subset=highlight_cols)
-                st.dataframe(styled_df, width="stretch", hide_index=True)
-            else:
-                st.dataframe(opt_df, width="stretch", hide_index=True)
-        else:
-            st.info("No option trades found for summary.")
+        _render_summary_section(
+            "📝 Option Trades Summary", futures["options"].result(),
+            "No option trades found for summary.")
     st.markdown("---")
 
     with st.spinner("Loading tax summary..."):
-        st.subheader("💵 Tax Summary by Year")
-        summary_df = tax_summary()
-        if not summary_df.empty:
-            highlight_cols = [col for col in summary_df.columns if col.lower() in ["total gain/loss","total estimated tax"]]
-            if highlight_cols:
-                styled_df = summary_df.style.map(color_profit_loss, subset=highlight_cols)
-                st.dataframe(styled_df, width="stretch", hide_index=True)
-            else:
-                st.dataframe(summary_df, width="stretch", hide_index=True)
-        else:
-            st.info("No closed trades found for tax summary.")
+        _render_summary_section(
+            "💵 Tax Summary by Year", futures["taxes"].result(),
+            "No closed trades found for tax summary.")
@@ -24,9 +24,10 @@ def data_entry() -> None:
         try:
             # parse ISO UTC and display in local timezone
             dt = datetime.datetime.fromisoformat(last_upload_iso)
-            # if naive assume UTC
+            # if naive (older rows) assume UTC
             if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=datetime.timezone.utc).astimezone()
+                dt = dt.replace(tzinfo=datetime.timezone.utc)
+            dt = dt.astimezone()
             local_str = dt.strftime("%Y-%m-%d %H:%M:%S %Z")
         except Exception:
             local_str = last_upload_iso
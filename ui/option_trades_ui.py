@@ -1,10 +1,17 @@
 import streamlit as st
-from db.db_utils import PLATFORM_CACHE, insert_option_trade, load_option_trades, load_option_trade_legs
+from db.db_utils import PLATFORM_CACHE, insert_option_trade, load_option_trades, load_option_trade_legs, clear_cache_selective
 import datetime
+import numpy as np
 import pandas as pd
 from typing import Optional, List, Dict
 import altair as alt
-from ui.utils import get_platform_id_to_name_map, color_profit_loss, get_option_price, get_batch_option_prices
+from ui.utils import get_platform_id_to_name_map, color_profit_loss_column, get_option_price, get_batch_option_prices, get_current_option_prices
+
+def _option_levels(strategy: pd.Series) -> np.ndarray:
+    """'L<n>' option approval level per row, looked up once per distinct strategy."""
+    from ui.option_strategies import get_strategy_level
+    codes, strategies = pd.factorize(strategy, use_na_sentinel=False)
+    return np.array([f"L{get_strategy_level(s)}" for s in strategies], dtype=object)[codes]
 
 def _map_and_reorder_columns(df: pd.DataFrame, platform_map: Dict[int, str], drop_cols: List[str], move_cols: List[str]) -> pd.DataFrame:
     """Map platform_id to name, drop and reorder columns as needed."""
@@ -112,37 +119,13 @@ def calculate_unrealized_pnl(df: pd.DataFrame, legs_by_trade: Optional[Dict] = N
                 multi_leg_pnl[trade_id] = round(pnl_total, 2)
 
     # --- Single-leg P&L via parent trade fields ---
-    # Extract strategy type from strategy column for single-leg trades
-    df['option_type'] = df['strategy'].apply(lambda x: 'call' if 'call' in str(x).lower() else 'put')
-
     # Only fetch prices for trades NOT handled by multi-leg logic
     single_leg_ids = set(df['id'].tolist()) - set(multi_leg_pnl.keys()) if 'id' in df.columns else set()
     df_single = df[df['id'].isin(single_leg_ids)] if 'id' in df.columns else df
 
-    current_prices: Dict = {}
-    for ticker in df_single['ticker'].unique():
-        ticker_trades = df_single[df_single['ticker'] == ticker].to_dict('records')
-        options_list = [
-            {
-                'strike': float(t['strike_price']),
-                'expiry': str(t['expiry_date']),
-                'type': t['option_type']
-            }
-            for t in ticker_trades
-        ]
-        prices_df = get_batch_option_prices(ticker, options_list)
-        for _, row in prices_df.iterrows():
-            key = (ticker, float(row['strike']), str(row['expiry']), row['type'])
-            current_prices[key] = row.get('current_price')
-
-    # Apply current prices to single-leg rows
-    df['current_price'] = df.apply(
-        lambda row: current_prices.get(
-            (row['ticker'], float(row['strike_price']), str(row['expiry_date']), row['option_type']),
-            None
-        ) if ('id' not in df.columns or row.get('id') in single_leg_ids) else None,
-        axis=1
-    )
+    # One batched price fetch per ticker; rows priced by the legs above stay None
+    single_prices = get_current_option_prices(df_single).reindex(df.index)
+    df['current_price'] = single_prices.astype(object).where(single_prices.notna(), None)
 
     # Calculate unrealized P&L — multi-leg overrides single-leg
     def calc_pnl(row):
@@ -164,7 +147,6 @@ def calculate_unrealized_pnl(df: pd.DataFrame, legs_by_trade: Optional[Dict] = N
         return round(pnl, 2)
 
     df['unrealized_pnl'] = df.apply(calc_pnl, axis=1)
-    df = df.drop(columns=['option_type'], errors='ignore')
     return df
 
 def get_option_trades_summary() -> pd.DataFrame:
@@ -220,8 +202,8 @@ def option_trades_ui() -> None:
     platform_map = get_platform_id_to_name_map()
     # Manual refresh control for option chains (clears relevant cached data)
     if st.button("🔄 Refresh Option Chains"):
-        # Clears all st.cache_data caches (including option chains) to force fresh fetches
-        st.cache_data.clear()
+        # Only the option chain and price caches; trades, positions and cash stay cached
+        clear_cache_selective(['option_chains'])
         st.success("Option chain cache cleared — refreshing data...")
         st.rerun()
 
@@ -260,8 +242,7 @@ def option_trades_ui() -> None:
         
         st.header("🟢 Open Option Trades")
         if df_open is not None:
-            from ui.option_strategies import get_strategy_level
-            df_open['Option Level'] = df_open['strategy'].apply(lambda s: f"L{get_strategy_level(s)}")
+            df_open['Option Level'] = _option_levels(df_open['strategy'])
 
             # Add legs summary column for multi-leg trades (legs already loaded above)
             if 'id' in pd.DataFrame(open_trades).columns:
@@ -286,7 +267,7 @@ def option_trades_ui() -> None:
             # Highlight profit/loss columns if present
             highlight_cols = [col for col in df_open.columns if col in ["unrealized_pnl"]]
             if highlight_cols:
-                styled_df = df_open.style.map(color_profit_loss, subset=highlight_cols)
+                styled_df = df_open.style.apply(color_profit_loss_column, subset=highlight_cols)
                 st.dataframe(styled_df, width="stretch", hide_index=True)
             else:
                 st.dataframe(df_open, width="stretch", hide_index=True)
@@ -314,8 +295,7 @@ def option_trades_ui() -> None:
         )
         if closed_trades:
             df_closed = pd.DataFrame(closed_trades)
-            from ui.option_strategies import get_strategy_level
-            df_closed['Option Level'] = df_closed['strategy'].apply(lambda s: f"L{get_strategy_level(s)}")
+            df_closed['Option Level'] = _option_levels(df_closed['strategy'])
 
             df_closed = _map_and_reorder_columns(
                 df_closed,
@@ -339,7 +319,7 @@ def option_trades_ui() -> None:
             # Highlight profit/loss columns if present
             highlight_cols = [col for col in df_closed.columns if col in ["profit_loss", "gain", "percentage"]]
             if highlight_cols:
-                styled_df = df_closed.style.map(color_profit_loss, subset=highlight_cols)
+                styled_df = df_closed.style.apply(color_profit_loss_column, subset=highlight_cols)
                 st.dataframe(styled_df, width="stretch", hide_index=True)
             else:
                 st.dataframe(df_closed, width="stretch", hide_index=True)
@@ -377,7 +357,7 @@ def option_trades_ui() -> None:
             strategy_agg['Total P/L'] = strategy_agg['Total P/L'].round(2)
             strategy_agg['Avg P/L'] = strategy_agg['Avg P/L'].round(2)
             pnl_cols_strat = ['Total P/L', 'Avg P/L']
-            styled_strat = strategy_agg.style.map(color_profit_loss, subset=pnl_cols_strat)
+            styled_strat = strategy_agg.style.apply(color_profit_loss_column, subset=pnl_cols_strat)
             st.dataframe(styled_strat, width="stretch", hide_index=True)
 
             # ── Table 2: P&L by Strategy & Ticker ────────────────────────
@@ -394,7 +374,7 @@ def option_trades_ui() -> None:
             # Sort by Ticker, then Strategy 
             strat_ticker_agg = strat_ticker_agg.sort_values(['Ticker', 'Strategy'], ascending=[True, True])
             pnl_cols_st = ['Total P/L', 'Avg P/L']
-            styled_st = strat_ticker_agg.style.map(color_profit_loss, subset=pnl_cols_st)
+            styled_st = strat_ticker_agg.style.apply(color_profit_loss_column, subset=pnl_cols_st)
             st.dataframe(styled_st, width="stretch", hide_index=True)
         else:
             st.info("No closed option trades found for aggregate summary.")
@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
 import yfinance as yf
-from db.db_utils import PLATFORM_CACHE, load_positions, load_option_trades
+from db.db_utils import PLATFORM_CACHE, load_positions, load_option_trades, register_cache
 from typing import Optional, List, Dict
 import altair as alt
-from ui.utils import color_profit_loss, get_platform_id_to_name_map
+from ui.utils import color_profit_loss_column, get_platform_id_to_name_map
+from config import Config
 
 @st.cache_data(ttl=300, show_spinner=False)
 def _get_ticker_prices(tickers: List[str]) -> Dict[str, Optional[float]]:
@@ -42,13 +43,16 @@ def _get_ticker_prices(tickers: List[str]) -> Dict[str, Optional[float]]:
                 price_map[t] = None
     return price_map
 
-@st.cache_data(ttl=120, show_spinner=False)
+# Shared by every portfolio and dashboard summary in a run; on the same TTL
+# as the dashboard summaries built from it so they expire together
+@register_cache('positions')
+@st.cache_data(ttl=Config.CACHE_TTL['portfolio'], show_spinner=False)
 def _get_portfolio_df() -> pd.DataFrame:
     """Returns a DataFrame with portfolio holdings, including current price and unrealized gain/loss."""
     open_positions = load_positions()
-    if not open_positions:
+    if open_positions.empty:
         return pd.DataFrame(columns=["platform", "ticker", "total_quantity", "average_price", "trade_cost", "current_price", "current_value", "unrealized_gain", "percent_profit_loss"])
-    df = pd.DataFrame(open_positions)
+    df = open_positions.copy()
     platform_map = get_platform_id_to_name_map()
     df["platform"] = df["platform_id"].map(platform_map)
     summary = (
@@ -88,14 +92,15 @@ def get_position_summary() -> pd.DataFrame:
     Includes equities only (stocks and ETFs). Options excluded from portfolio summary."""
     portfolio_df = _get_portfolio_df()
     rows = []
+    if portfolio_df.empty:
+        return pd.DataFrame(rows)
+    # Equity totals (stocks and ETFs only) for every platform in one pass
+    equity_totals = portfolio_df.groupby("platform")[["trade_cost", "current_value", "unrealized_gain"]].sum()
     for platform in PLATFORM_CACHE.keys():
-        # Get equity data (stocks and ETFs only)
-        equity_group = portfolio_df[portfolio_df["platform"] == platform]
-        equity_investment = equity_group["trade_cost"].sum() if not equity_group.empty else 0.0
-        
-        if not equity_group.empty or equity_investment > 0:
-            total_portfolio_value = equity_group["current_value"].sum() if not equity_group.empty else 0.0
-            total_unrealized_gain = equity_group["unrealized_gain"].sum() if not equity_group.empty else 0.0
+        if platform in equity_totals.index:
+            equity_investment = equity_totals.at[platform, "trade_cost"]
+            total_portfolio_value = equity_totals.at[platform, "current_value"]
+            total_unrealized_gain = equity_totals.at[platform, "unrealized_gain"]
             percent_unrealized = (total_unrealized_gain / equity_investment * 100) if equity_investment else 0.0
             rows.append({
                 "Platform": platform,
@@ -121,7 +126,8 @@ def get_position_summary_with_total() -> pd.DataFrame:
             "Total Unrealized Gains": round(total_unrealized, 2),
             "Pct Unrealized Gain": f"{round(percent_unrealized, 2)}%"
         }
-        summary_df = pd.concat([summary_df, pd.DataFrame([overall_row])], ignore_index=True)
+        # Summary frames have a RangeIndex, so this appends in place
+        summary_df.loc[len(summary_df)] = overall_row
     return summary_df
 
 def portfolio_ui() -> None:
@@ -133,7 +139,7 @@ def portfolio_ui() -> None:
         if not summary_df.empty:
             highlight_cols = [col for col in summary_df.columns if col.lower() in ["total unrealized gains", "pct unrealized gain"]]
             if highlight_cols:
-                styled_df = summary_df.style.map(color_profit_loss, subset=highlight_cols)
+                styled_df = summary_df.style.apply(color_profit_loss_column, subset=highlight_cols)
                 st.dataframe(styled_df, width="stretch", hide_index=True)
             else:
                 st.dataframe(summary_df, width="stretch", hide_index=True)
@@ -170,7 +176,7 @@ def portfolio_ui() -> None:
                         long_df["percent_profit_loss"] = long_df["percent_profit_loss"].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "")
                     highlight_cols = [col for col in long_df.columns if col.lower() in [ "percent_profit_loss", "unrealized_gain"]]
                     if highlight_cols:
-                        styled_df = long_df.style.map(color_profit_loss, subset=highlight_cols)
+                        styled_df = long_df.style.apply(color_profit_loss_column, subset=highlight_cols)
                         st.dataframe(styled_df, width="stretch", hide_index=True)
                     else:
                         st.dataframe(long_df, width="stretch", hide_index=True)
@@ -183,7 +189,7 @@ def portfolio_ui() -> None:
                         short_df["percent_profit_loss"] = short_df["percent_profit_loss"].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "")
                     highlight_cols = [col for col in short_df.columns if col.lower() in [ "percent_profit_loss", "unrealized_gain"]]
                     if highlight_cols:
-                        styled_df = short_df.style.map(color_profit_loss, subset=highlight_cols)
+                        styled_df = short_df.style.apply(color_profit_loss_column, subset=highlight_cols)
                         st.dataframe(styled_df, width="stretch", hide_index=True)
                     else:
                         st.dataframe(short_df, width="stretch", hide_index=True)
@@ -4,7 +4,7 @@ from db.db_utils import PLATFORM_CACHE
 import pandas as pd
 from typing import Optional, List
 import altair as alt
-from ui.utils import get_platform_id_to_name_map, color_profit_loss
+from ui.utils import get_platform_id_to_name_map, color_profit_loss_column
 
 def _weighted_avg(df: pd.DataFrame, value_col: str, weight_col: str) -> float:
     """Compute weighted average for a DataFrame column."""
@@ -23,9 +23,10 @@ def get_positions_summary() -> pd.DataFrame:
     """Returns a summary DataFrame for open/closed positions and total P/L."""
     open_positions = load_positions()
     closed_positions = load_closed_positions()
-    total_pnl = sum(p.get("profit_loss", 0.0) or 0.0 for p in closed_positions)
-    long_open = sum(1 for p in open_positions if (p.get("direction") or "Long") == "Long")
-    short_open = sum(1 for p in open_positions if (p.get("direction") or "Long") == "Short")
+    total_pnl = closed_positions["profit_loss"].fillna(0.0).sum()
+    open_directions = open_positions["direction"].fillna("Long")
+    long_open = int((open_directions == "Long").sum())
+    short_open = int((open_directions == "Short").sum())
     return pd.DataFrame([{
         "Open Positions (🔼 Long)": long_open,
         "Open Positions (🔻 Short)": short_open,
@@ -82,8 +83,8 @@ def positions_ui() -> None:
 
         # --- Open Positions ---
         st.subheader("🟢 Current Positions")
-        if positions:
-            df = pd.DataFrame(positions)
+        if not positions.empty:
+            df = positions.copy()
             # Ensure direction column exists; default to Long for legacy rows
             if "direction" not in df.columns:
                 df["direction"] = "Long"
@@ -92,10 +93,11 @@ def positions_ui() -> None:
             if "platform_id" in df.columns:
                 platform_map = get_platform_id_to_name_map()
                 df["Platform"] = df["platform_id"].map(platform_map)
-            for platform in sorted(df["Platform"].unique()):
-                platform_df = df[df["Platform"] == platform]
-                has_long = not platform_df[platform_df["direction"] == "Long"].empty
-                has_short = not platform_df[platform_df["direction"] == "Short"].empty
+            # One groupby pass splits the positions by platform, sorted by name
+            for platform, platform_df in df.groupby("Platform"):
+                directions = set(platform_df["direction"])
+                has_long = "Long" in directions
+                has_short = "Short" in directions
                 if has_long and has_short:
                     icon = "🔼🔻"
                 elif has_short:
@@ -110,8 +112,8 @@ def positions_ui() -> None:
 
         # --- Closed Positions ---
         st.subheader("🔴 Closed Positions")
-        if closed_positions:
-            df_closed = pd.DataFrame(closed_positions)
+        if not closed_positions.empty:
+            df_closed = closed_positions.copy()
             if "direction" not in df_closed.columns:
                 df_closed["direction"] = "Long"
             else:
@@ -119,9 +121,8 @@ def positions_ui() -> None:
             if "platform_id" in df_closed.columns:
                 platform_map = get_platform_id_to_name_map()
                 df_closed["Platform"] = df_closed["platform_id"].map(platform_map)
-            for platform in sorted(df_closed["Platform"].unique()):
+            for platform, platform_df in df_closed.groupby("Platform"):
                 with st.expander(f"{platform} - Closed Trades 📉", expanded=False):
-                    platform_df = df_closed[df_closed["Platform"] == platform]
                     summary_closed = (
                         platform_df
                         .groupby(["ticker", "direction"])
@@ -143,7 +144,7 @@ def positions_ui() -> None:
                     st.markdown("**Summary by Ticker & Direction**")
                     highlight_cols = [col for col in summary_closed.columns if col.lower() in ["profit/loss"]]
                     if highlight_cols:
-                        styled_df = summary_closed.style.map(color_profit_loss, subset=highlight_cols)
+                        styled_df = summary_closed.style.apply(color_profit_loss_column, subset=highlight_cols)
                         st.dataframe(styled_df, width="stretch", hide_index=True)
                     else:
                         st.dataframe(summary_closed, width="stretch", hide_index=True)
@@ -4,8 +4,8 @@ import datetime
 from datetime import timedelta
 import altair as alt
 from collections import defaultdict
-from db.db_utils import load_closed_positions, load_option_trades, load_all_trades
-from ui.utils import color_profit_loss
+from db.db_utils import load_closed_positions, load_option_trades, load_all_trades, register_cache
+from ui.utils import color_profit_loss_column
 
 LONG_TERM_TAX_RATE = 0.15
 SHORT_TERM_TAX_RATE = 0.24
@@ -264,6 +264,7 @@ def detect_wash_sales(closed_positions, closed_options, all_raw_trades, all_opti
 # Aggregation (with wash-sale adjustments)
 # ---------------------------------------------------------------------------
 
+@register_cache('positions', 'options', 'trades')
 @st.cache_data(ttl=300, show_spinner=False)
 def aggregate_gains():
     """Aggregate gains for stocks and options, grouped by year and term.
@@ -273,7 +274,7 @@ def aggregate_gains():
         yearly_breakdown (dict)— {(year, asset, term): gain}
         wash_sales (list)      — raw wash-sale records from detect_wash_sales()
     """
-    closed_positions = load_closed_positions()
+    closed_positions = load_closed_positions().to_dict("records")
     closed_options = []
     for status in ["expired", "exercised", "closed"]:
         closed_options += load_option_trades(status=status)
@@ -422,7 +423,7 @@ def taxes_ui() -> None:
 
         styled = (
             summary_df.style
-            .map(color_profit_loss, subset=["Raw Gain/Loss", "Adjusted Gain/Loss", "Total Estimated Tax"])
+            .apply(color_profit_loss_column, subset=["Raw Gain/Loss", "Adjusted Gain/Loss", "Total Estimated Tax"])
             .map(_color_wash_sale, subset=["Wash Sale Disallowed"])
         )
         st.dataframe(styled, width="stretch", hide_index=True)
@@ -465,7 +466,7 @@ def taxes_ui() -> None:
         df_breakdown = pd.DataFrame(rows)
         st.subheader("Summary by Tax Year, Asset, and Term")
         hl = [c for c in df_breakdown.columns if c.lower() in ("estimated tax", "gain/loss")]
-        styled_bd = df_breakdown.style.map(color_profit_loss, subset=hl) if hl else df_breakdown
+        styled_bd = df_breakdown.style.apply(color_profit_loss_column, subset=hl) if hl else df_breakdown
         st.dataframe(styled_bd, width="stretch", hide_index=True)
     else:
         st.info("No closed trades found for capital gains calculation.")
@@ -508,7 +509,7 @@ def taxes_ui() -> None:
 
         styled_ws = (
             ws_df.style
-            .map(color_profit_loss, subset=["Raw Loss", "Allowed Loss"])
+            .apply(color_profit_loss_column, subset=["Raw Loss", "Allowed Loss"])
             .map(_color_wash_sale, subset=["Disallowed Loss"])
         )
         st.dataframe(styled_ws, width="stretch", hide_index=True)
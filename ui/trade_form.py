@@ -1,5 +1,5 @@
 import streamlit as st
-from db.db_utils import PLATFORM_CACHE, load_platforms
+from db.db_utils import PLATFORM_CACHE, load_platforms, get_st_connection, clear_cache_selective
 from sqlalchemy import text
 from typing import Optional
 
@@ -69,13 +69,14 @@ def trade_form() -> None:
                 "direction": direction,
             }
             try:
-                conn = st.connection("postgresql", type="sql")
+                conn = get_st_connection()
                 columns = list(trade_data.keys())
                 placeholders = ", ".join([f":{col}" for col in columns])
                 sql = text(f"INSERT INTO trades ({', '.join(columns)}) VALUES ({placeholders})")
                 with conn.session as session:
                     session.execute(sql, trade_data)
                     session.commit()
+                clear_cache_selective(['trades'])
                 st.success("Trade added successfully!")
                 # Reset form values to defaults by deleting keys
                 for key in defaults.keys():
@@ -1,9 +1,10 @@
 """Shared utility functions for the trade tracker UI."""
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import yfinance as yf
 import streamlit as st
-from db.db_utils import PLATFORM_CACHE
+from db.db_utils import PLATFORM_CACHE, register_cache
 import datetime
 import pytz
 from config import Config
@@ -20,9 +21,40 @@ def color_profit_loss(val):
     return f"color: {color}"
 
 
+def color_profit_loss_column(col: pd.Series) -> np.ndarray:
+    """Column-wise color_profit_loss for Styler.apply: one numeric pass per column."""
+    v = pd.to_numeric(col.astype(str).str.replace('%', '', regex=False), errors='coerce').to_numpy()
+    return np.select([v > 0, v < 0, v == 0], ["color: green", "color: red", "color: black"], default="")
+
+
+def option_type_from_strategy(strategy: pd.Series) -> pd.Series:
+    """'call' if the strategy name mentions a call, else 'put', in one vectorized string pass."""
+    is_call = strategy.astype(str).str.lower().str.contains('call', regex=False).to_numpy(dtype=bool)
+    return pd.Series(np.where(is_call, 'call', 'put'), index=strategy.index)
+
+
 def get_platform_id_to_name_map() -> Dict[int, str]:
-    """Get a mapping of platform IDs to their names."""
-    return {v: k for k, v in PLATFORM_CACHE.cache.items()}
+    """Get a mapping of platform IDs to their names (shared; do not modify)."""
+    return PLATFORM_CACHE.id_to_name
+
+
+def platform_categorical(platform_ids: pd.Series, platform_map: Dict[int, str]) -> pd.Categorical:
+    """Map platform IDs to a Categorical of platform names in one array gather.
+
+    Categories are the names in sorted order, so groupbys on the result sort
+    the same way as on plain names; unknown or missing IDs become NaN.
+    """
+    names = sorted(set(platform_map.values()))
+    codes = np.full(len(platform_ids), -1, dtype=np.int64)
+    if platform_map:
+        position = {name: i for i, name in enumerate(names)}
+        lookup = np.full(max(platform_map) + 1, -1, dtype=np.int64)
+        for pid, name in platform_map.items():
+            lookup[pid] = position[name]
+        ids = pd.to_numeric(platform_ids, errors='coerce').to_numpy(dtype=float)
+        known = (ids >= 0) & (ids < len(lookup)) & (ids == np.floor(ids))
+        codes[known] = lookup[ids[known].astype(np.int64)]
+    return pd.Categorical.from_codes(codes, categories=names)
 
 
 def apply_profit_loss_styling(df: pd.DataFrame, cols: List[str]):
@@ -36,7 +68,7 @@ def apply_profit_loss_styling(df: pd.DataFrame, cols: List[str]):
         Styled DataFrame if columns exist, otherwise returns the DataFrame as-is
     """
     if cols:
-        return df.style.map(color_profit_loss, subset=cols)
+        return df.style.apply(color_profit_loss_column, subset=cols)
     return df
 
 def _extract_price_from_chain(chain_df, strike: float) -> Optional[float]:
@@ -74,6 +106,7 @@ def _extract_price_from_chain(chain_df, strike: float) -> Optional[float]:
     return None
 
 
+@register_cache('option_chains')
 @st.cache_data(ttl=Config.CACHE_TTL['option_chains'], show_spinner=False)
 def get_option_chain_for_ticker(ticker: str) -> Optional[Dict]:
     """Fetch option chain data from Yahoo Finance for a given ticker.
@@ -95,6 +128,7 @@ def get_option_chain_for_ticker(ticker: str) -> Optional[Dict]:
         return None
 
 
+@register_cache('option_chains')
 @st.cache_data(ttl=Config.CACHE_TTL['option_chains'], show_spinner=False)
 def get_option_chain(ticker: str, expiry: str) -> Optional[Dict[str, pd.DataFrame]]:
     """Fetch and cache the option chain (calls/puts) for a specific ticker and expiry.
@@ -115,6 +149,7 @@ def get_option_chain(ticker: str, expiry: str) -> Optional[Dict[str, pd.DataFram
         return None
 
 
+@register_cache('option_chains')
 @st.cache_data(ttl=Config.CACHE_TTL['option_chains'], show_spinner=False)
 def get_option_price(ticker: str, expiry: str, strike: float, option_type: str) -> Optional[float]:
     """Fetch current option price from a cached option chain.
@@ -188,78 +223,111 @@ def get_batch_option_prices(ticker: str, options_list: List[Dict]) -> pd.DataFra
         return pd.DataFrame(options_list)
 
 
-def get_platform_option_exposure(options_list: List[Dict]) -> Dict[str, float]:
+def _debit_sign(transaction_type: pd.Series) -> np.ndarray:
+    """int8 sign per row: 1 for debits, -1 for everything else (case-insensitive)."""
+    return np.where(transaction_type.str.lower().to_numpy() == 'debit', np.int8(1), np.int8(-1))
+
+
+def _signed_contract_value(price: pd.Series, sign: np.ndarray) -> np.ndarray:
+    """price * 100 per row, multiplied by the _debit_sign of the row."""
+    return price.to_numpy(dtype=np.float64) * 100.0 * sign
+
+
+def _option_platforms(opts_df: pd.DataFrame) -> Optional[pd.Series]:
+    """Platform name per option row: the 'Platform' column if the caller set one, else mapped from platform_id."""
+    if 'Platform' in opts_df.columns:
+        return opts_df['Platform']
+    if 'platform_id' in opts_df.columns:
+        return opts_df['platform_id'].map(get_platform_id_to_name_map())
+    return None
+
+
+def _open_option_prices(opts_df: pd.DataFrame) -> pd.Series:
+    """option_open_price per row as float, 0 where missing."""
+    if 'option_open_price' not in opts_df.columns:
+        return pd.Series(0.0, index=opts_df.index)
+    return pd.to_numeric(opts_df['option_open_price'], errors='coerce').fillna(0)
+
+
+def get_current_option_prices(opts_df: pd.DataFrame) -> pd.Series:
+    """Current price per option row (NaN when unknown), one get_batch_option_prices call per ticker.
+
+    Args:
+        opts_df: Option trades with ticker, strategy, strike_price and expiry_date columns
+
+    Returns:
+        Float Series aligned with opts_df's index
+    """
+    option_type = option_type_from_strategy(opts_df['strategy'])
+    strike = pd.to_numeric(opts_df['strike_price'], errors='coerce')
+    expiry = opts_df['expiry_date'].astype(str)
+    prices = pd.Series(np.nan, index=opts_df.index)
+    for ticker, index in opts_df.groupby('ticker').groups.items():
+        options_for_ticker = [
+            {'strike': float(k), 'expiry': e, 'type': t}
+            for k, e, t in zip(strike[index], expiry[index], option_type[index])
+        ]
+        prices_df = get_batch_option_prices(ticker, options_for_ticker)
+        # get_batch_option_prices returns one row per input option, in order
+        if 'current_price' in prices_df.columns:
+            prices[index] = pd.to_numeric(prices_df['current_price'], errors='coerce').to_numpy()
+    return prices
+
+
+def _sum_by_platform(values: pd.Series, platforms: Optional[pd.Series]) -> Dict[str, float]:
+    """{platform: total} for per-row values; rows without a platform are dropped."""
+    if platforms is None:
+        return {}
+    return {p: float(v) for p, v in values.groupby(platforms, observed=True).sum().items()}
+
+
+def compute_option_aggregates(options_list: List[Dict], current_prices: Optional[Sequence[Optional[float]]] = None) -> pd.DataFrame:
+    """Per-platform cost basis and market value of options in one pass.
+
+    Both are price * 100 * (1 for debit, -1 for credit): 'Cost Basis' uses
+    option_open_price, 'Market Value' the current price (0 when it cannot be
+    fetched). Current prices are fetched once per ticker and shared.
+
+    Args:
+        options_list: List of option trade dicts with keys: platform_id (or Platform), ticker,
+            strategy, strike_price, expiry_date, option_open_price, transaction_type
+        current_prices: Current price per option in options_list order, for callers that
+            already have them; nothing is fetched then
+
+    Returns:
+        DataFrame indexed by platform name with float columns 'Cost Basis' and 'Market Value'
+    """
+    columns = ['Cost Basis', 'Market Value']
+    opts_df = pd.DataFrame(options_list)
+    platforms = _option_platforms(opts_df) if not opts_df.empty else None
+    if platforms is None:
+        return pd.DataFrame(columns=columns, dtype=float).rename_axis('Platform')
+    sign = _debit_sign(opts_df['transaction_type'])
+    open_price = _open_option_prices(opts_df)
+    if current_prices is None:
+        current_price = get_current_option_prices(opts_df)
+    else:
+        current_price = pd.to_numeric(pd.Series(list(current_prices), index=opts_df.index, dtype=object), errors='coerce')
+    aggregates = pd.DataFrame({
+        'Cost Basis': _signed_contract_value(open_price, sign),
+        'Market Value': _signed_contract_value(current_price.fillna(0), sign),
+    }, index=opts_df.index)
+    return aggregates.groupby(platforms.rename('Platform'), observed=True).sum().astype(float)
+
+
+def get_platform_option_exposure(options_list: List[Dict], current_prices: Optional[Sequence[Optional[float]]] = None) -> Dict[str, float]:
     """Calculate option exposure by platform using real-time prices.
     
     Args:
         options_list: List of option trade dicts
+        current_prices: Optional current price per option; see compute_option_aggregates
         
     Returns:
         Dictionary mapping platform name to total option exposure
     """
-    from db.db_utils import load_option_trades
-    
-    platform_exposure = {}
-    
     if not options_list:
-        return platform_exposure
-    
-    # Convert to DataFrame for easier processing
-    opts_df = pd.DataFrame(options_list)
-    
-    if opts_df.empty:
-        return platform_exposure
-    
-    # Extract option type from strategy
-    opts_df['option_type'] = opts_df['strategy'].apply(lambda x: 'call' if 'call' in str(x).lower() else 'put')
-    
-    # Ensure numeric columns are float type (handle Decimal from database)
-    opts_df['strike_price'] = pd.to_numeric(opts_df['strike_price'], errors='coerce')
-    
-    # Fetch current prices for all options grouped by ticker
-    current_prices = {}
-    for ticker in opts_df['ticker'].unique():
-        ticker_opts = opts_df[opts_df['ticker'] == ticker].to_dict('records')
-        options_list_for_ticker = [
-            {
-                'strike': float(t['strike_price']),
-                'expiry': str(t['expiry_date']),
-                'type': t['option_type']
-            }
-            for t in ticker_opts
-        ]
-        
-        prices_df = get_batch_option_prices(ticker, options_list_for_ticker)
-        for _, row in prices_df.iterrows():
-            key = (ticker, float(row['strike']), str(row['expiry']), row['type'])
-            current_prices[key] = row.get('current_price')
-    
-    # Apply current prices and calculate exposure
-    opts_df['current_price'] = opts_df.apply(
-        lambda row: current_prices.get(
-            (row['ticker'], float(row['strike_price']), str(row['expiry_date']), row['option_type']),
-            None
-        ),
-        axis=1
-    )
-    
-    # Convert to numeric and calculate exposure
-    opts_df['current_price'] = pd.to_numeric(opts_df['current_price'], errors='coerce')
-    opts_df['transaction_type'] = opts_df['transaction_type'].str.lower()
-    
-    # Calculate exposure: current_price * 100 * (1 for debit, -1 for credit)
-    opts_df['Option Exposure'] = opts_df.apply(
-        lambda x: float(x['current_price'] or 0) * 100.0 * (1 if x['transaction_type'] == 'debit' else -1),
-        axis=1
-    )
-    
-    # Group by platform
-    if 'Platform' in opts_df.columns:
-        platform_exp = opts_df.groupby('Platform', as_index=False)['Option Exposure'].sum()
-        for _, row in platform_exp.iterrows():
-            platform_exposure[row['Platform'] or 'Unknown'] = float(row['Option Exposure'] or 0.0)
-    
-    return platform_exposure
+        return {}
+    return compute_option_aggregates(options_list, current_prices)['Market Value'].to_dict()
 
 
 def get_options_cost_basis(options_list: List[Dict]) -> Dict[str, float]:
@@ -276,107 +344,25 @@ def get_options_cost_basis(options_list: List[Dict]) -> Dict[str, float]:
     if not options_list:
         return {}
     
-    platform_cost_basis = {}
-    
-    # Get platform mapping
-    from db.db_utils import load_option_trades
-    platform_map = get_platform_id_to_name_map()
-    
-    # Convert to DataFrame for easier processing
+    # Cost basis needs no prices, so this skips compute_option_aggregates' fetch
     opts_df = pd.DataFrame(options_list)
-    
-    # Map platform IDs to names
-    if 'platform_id' in opts_df.columns:
-        opts_df['Platform'] = opts_df['platform_id'].map(platform_map)
-    
-    # Ensure numeric types
-    opts_df['option_open_price'] = pd.to_numeric(opts_df.get('option_open_price', 0), errors='coerce').fillna(0)
-    opts_df['transaction_type'] = opts_df['transaction_type'].str.lower()
-    
-    # Calculate cost basis: option_open_price * 100 * (1 for debit, -1 for credit)
-    opts_df['Cost Basis'] = opts_df.apply(
-        lambda x: float(x['option_open_price'] or 0) * 100.0 * (1 if x['transaction_type'] == 'debit' else -1),
-        axis=1
-    )
-    
-    # Group by platform
-    if 'Platform' in opts_df.columns:
-        platform_cb = opts_df.groupby('Platform', as_index=False)['Cost Basis'].sum()
-        for _, row in platform_cb.iterrows():
-            platform_cost_basis[row['Platform'] or 'Unknown'] = float(row['Cost Basis'] or 0.0)
-    
-    return platform_cost_basis
+    open_price = _open_option_prices(opts_df)
+    cost_basis = pd.Series(_signed_contract_value(open_price, _debit_sign(opts_df['transaction_type'])), index=opts_df.index)
+    return _sum_by_platform(cost_basis, _option_platforms(opts_df))
 
 
-def get_options_portfolio_value(options_list: List[Dict]) -> Dict[str, float]:
+def get_options_portfolio_value(options_list: List[Dict], current_prices: Optional[Sequence[Optional[float]]] = None) -> Dict[str, float]:
     """
     Calculate current portfolio value for options grouped by platform using real-time prices.
     Portfolio Value = current_price * 100 * (1 for debit, -1 for credit)
     
     Args:
         options_list: List of option trade dicts with keys: platform_id, ticker, strike_price, expiry_date, option_type, transaction_type
+        current_prices: Optional current price per option; see compute_option_aggregates
     
     Returns:
         Dict mapping platform name to total current portfolio value for open options
     """
     if not options_list:
         return {}
-    
-    platform_portfolio_value = {}
-    
-    # Get platform mapping
-    platform_map = get_platform_id_to_name_map()
-    
-    # Convert to DataFrame for easier processing
-    opts_df = pd.DataFrame(options_list)
-    
-    # Map platform IDs to names
-    if 'platform_id' in opts_df.columns:
-        opts_df['Platform'] = opts_df['platform_id'].map(platform_map)
-    
-    # Extract option type and fetch current prices
-    opts_df['option_type'] = opts_df['strategy'].apply(lambda x: 'call' if 'call' in str(x).lower() else 'put')
-    
-    # Fetch current prices for all options
-    current_prices = {}
-    for ticker in opts_df['ticker'].unique():
-        ticker_opts = opts_df[opts_df['ticker'] == ticker].to_dict('records')
-        options_list_for_ticker = [
-            {
-                'strike': t['strike_price'],
-                'expiry': str(t['expiry_date']),
-                'type': t['option_type']
-            }
-            for t in ticker_opts
-        ]
-        prices_df = get_batch_option_prices(ticker, options_list_for_ticker)
-        for _, row in prices_df.iterrows():
-            key = (ticker, row['strike'], str(row['expiry']), row['type'])
-            current_prices[key] = row.get('current_price', 0)
-    
-    # Apply current prices
-    opts_df['current_price'] = opts_df.apply(
-        lambda row: current_prices.get(
-            (row['ticker'], row['strike_price'], str(row['expiry_date']), row['option_type']),
-            row.get('option_open_price', 0)  # fallback to open price
-        ),
-        axis=1
-    )
-    
-    # Ensure numeric types
-    opts_df['current_price'] = pd.to_numeric(opts_df['current_price'], errors='coerce').fillna(0)
-    opts_df['transaction_type'] = opts_df['transaction_type'].str.lower()
-    
-    # Calculate portfolio value: current_price * 100 * (1 for debit, -1 for credit)
-    opts_df['Portfolio Value'] = opts_df.apply(
-        lambda x: float(x['current_price'] or 0) * 100.0 * (1 if x['transaction_type'] == 'debit' else -1),
-        axis=1
-    )
-    
-    # Group by platform
-    if 'Platform' in opts_df.columns:
-        platform_pv = opts_df.groupby('Platform', as_index=False)['Portfolio Value'].sum()
-        for _, row in platform_pv.iterrows():
-            platform_portfolio_value[row['Platform'] or 'Unknown'] = float(row['Portfolio Value'] or 0.0)
-    
-    return platform_portfolio_value
+    return compute_option_aggregates(options_list, current_prices)['Market Value'].to_dict()
@@ -1,17 +1,17 @@
 import streamlit as st
 import pandas as pd
 import altair as alt
-from db.db_utils import load_closed_positions, load_option_trades, PLATFORM_CACHE
+from db.db_utils import load_closed_positions, load_option_trades, PLATFORM_CACHE, register_cache
 import datetime
 
+@register_cache('positions')
 @st.cache_data(ttl=300, show_spinner=False)
 def get_weekly_pl_stocks():
     """Aggregate weekly profit/loss for stocks from closed positions."""
     closed_positions = load_closed_positions()
-    if not closed_positions:
+    if closed_positions.empty:
         return pd.DataFrame(columns=["Year", "Week", "Stock P/L"])
-    df = pd.DataFrame(closed_positions)
-    df = df.dropna(subset=["exit_date", "profit_loss"])
+    df = closed_positions.dropna(subset=["exit_date", "profit_loss"])
     df["exit_date"] = pd.to_datetime(df["exit_date"])
     df["Year"] = df["exit_date"].dt.year
     df["Week"] = df["exit_date"].dt.isocalendar().week
@@ -19,6 +19,7 @@ def get_weekly_pl_stocks():
     weekly = weekly.rename(columns={"profit_loss": "Stock P/L"})
     return weekly
 
+@register_cache('options')
 @st.cache_data(ttl=300, show_spinner=False)
 def get_weekly_pl_options():
     """Aggregate weekly profit/loss for options from closed option trades."""
@@ -37,10 +38,9 @@ def get_weekly_pl_options():
 def get_monthly_pl_stocks():
     """Aggregate monthly profit/loss for stocks from closed positions."""
     closed_positions = load_closed_positions()
-    if not closed_positions:
+    if closed_positions.empty:
         return pd.DataFrame(columns=["Year", "Month", "Stock P/L"])
-    df = pd.DataFrame(closed_positions)
-    df = df.dropna(subset=["exit_date", "profit_loss"])
+    df = closed_positions.dropna(subset=["exit_date", "profit_loss"])
     df["exit_date"] = pd.to_datetime(df["exit_date"])
     df["Year"] = df["exit_date"].dt.year
     df["Month"] = df["exit_date"].dt.month